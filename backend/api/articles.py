@@ -7,10 +7,12 @@ from datetime import datetime
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from backend.db.tables import (
+    PENDING_ARTICLES,
     StagingArticleTable,
     StagingProductTable,
     StagingArticleImageTable,
 )
+from backend.metrics import observe_stage
 from backend.services.approval import approve_article
 from backend.services.rejection import reject_article
 from shared.models import (
@@ -37,7 +39,7 @@ async def list_pending_articles():
     """
     articles = (
         await StagingArticleTable.select()
-        .where(StagingArticleTable.status == "pending")
+        .where(PENDING_ARTICLES)
         .order_by(StagingArticleTable.submitted_at, ascending=False)
         .run()
     )
@@ -96,7 +98,8 @@ async def approve(article_id: int):
     """
     Approve an article and move it to production.
     """
-    result = await approve_article(article_id, "admin")
+    with observe_stage("approve"):
+        result = await approve_article(article_id, "admin")
 
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
@@ -109,7 +112,8 @@ async def reject(article_id: int, request: RejectionRequest):
     """
     Reject an article with comments.
     """
-    result = await reject_article(article_id, "admin", request.comments)
+    with observe_stage("reject"):
+        result = await reject_article(article_id, "admin", request.comments)
 
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
@@ -197,3 +201,31 @@ async def get_article_by_uuid(workflow_uuid: str):
         "status": article["status"],
         "submitted_at": article["submitted_at"],
     }
+
+
+@router.get("/products/{product_id}/usages")
+async def get_product_usages(product_id: int):
+    """
+    Get every staging article that uses the same product as a staging
+    product, matched by product fingerprint.
+    """
+    from backend.services.products import find_product_usages
+
+    product = (
+        await StagingProductTable.select(StagingProductTable.fingerprint)
+        .where(StagingProductTable.staging_product_id == product_id)
+        .first()
+        .run()
+    )
+
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    if not product["fingerprint"]:
+        raise HTTPException(status_code=409, detail="Product has no fingerprint")
+
+    usages = await find_product_usages(product["fingerprint"])
+    return {
+        "fingerprint": product["fingerprint"],
+        "articles": len({u["staging_article_id"] for u in usages}),
+        "usages": usages,
+    }
@@ -0,0 +1,34 @@
+"""
+Blob API endpoints.
+Serves content-addressed blobs referenced from staging rows.
+"""
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from backend.services.blob_store import get_blob_store
+
+router = APIRouter(prefix="/api/blobs", tags=["Blobs"])
+
+
+@router.get("/{key}")
+async def get_blob(key: str, request: Request):
+    """
+    Get a blob by its SHA-256 key.
+
+    Blobs are immutable, so responses are cacheable forever and revalidate
+    with the key as ETag.
+    """
+    etag = f'"{key}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable",
+    }
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    blob = await get_blob_store().get(key)
+    if blob is None:
+        raise HTTPException(status_code=404, detail="Blob not found")
+
+    data, content_type = blob
+    return Response(content=data, media_type=content_type, headers=headers)
@@ -0,0 +1,69 @@
+"""
+Event stream API endpoint.
+Server-Sent Events feed of staging state changes for dashboards and the
+AI pipeline, replacing polling.
+"""
+
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from backend.services.events import CLOSED, EVENT_TYPES, broker
+
+router = APIRouter(prefix="/api/events", tags=["Events"])
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_INTERVAL = 15
+# Milliseconds clients wait before reconnecting
+RETRY_MS = 2000
+
+
+@router.get("")
+async def stream_events(types: Optional[str] = Query(None)):
+    """
+    Stream staging events as Server-Sent Events.
+
+    Event types: article_submitted, approved, rejected, rejection_acked;
+    ?types=a,b selects some of them. Each message's data is the event as
+    JSON. A client that falls too far behind receives an "overflow" event
+    and is disconnected; it should reconnect and re-read current state.
+    """
+    selected = None
+    if types:
+        selected = {name.strip() for name in types.split(",") if name.strip()}
+        unknown = selected - set(EVENT_TYPES)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown event type(s): {', '.join(sorted(unknown))}",
+            )
+
+    subscription = broker.subscribe(selected)
+
+    async def messages():
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(), timeout=HEARTBEAT_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+
+                if event is CLOSED:
+                    if subscription.overflowed:
+                        yield "event: overflow\ndata: {}\n\n"
+                    break
+
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        messages(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -3,29 +3,51 @@ AI Pipeline API endpoints.
 For the AI pipeline to submit articles and poll for rejections.
 """
 
-from typing import List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Dict, Any, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from backend.auth import verify_token
-from backend.db.tables import (
-    StagingArticleTable,
-    StagingProductTable,
-    StagingArticleImageTable,
-    StagingArticleTextTable,
-    StagingProductImageTable,
-    StagingProductTextTable,
+from backend.metrics import count_ingest_results, observe_stage
+from backend.services.ingest import (
+    SUBMIT_BATCH_MAX_ARTICLES,
+    InvalidPayload,
+    ingest_articles,
+    normalize_api_submission,
+    parse_payload,
+    submit_batch,
+    submit_stream,
+)
+from backend.services.jobs import enqueue_job, get_job
+from backend.services.rejection import (
+    REJECTION_CLAIM_MAX,
+    REJECTION_LEASE_SECONDS,
+    REJECTION_WAIT_MAX,
+    claim_rejections,
+    get_pending_rejections,
+    get_rejection_snapshot,
+    iter_rejection_snapshot,
+    mark_rejection_processed,
+    mark_rejections_processed,
+    rejection_fields,
+    wait_for_rejections,
 )
-from backend.services.rejection import get_pending_rejections, mark_rejection_processed
-from datetime import datetime
+from shared.models import ArticleSubmission, RejectionAckRequest
 
 router = APIRouter(prefix="/api/pipeline", tags=["Pipeline"])
 
 
 @router.post("/submit")
-async def submit_article(data: Dict[str, Any], token: str = Depends(verify_token)):
+async def submit_article(
+    request: Request,
+    async_mode: bool = Query(False, alias="async"),
+    token: str = Depends(verify_token),
+):
     """
     Submit a new article from AI pipeline to staging.
 
-    Expected data structure:
+    Expected data structure (see shared.models.ArticleSubmission):
     {
         "article": {...},
         "products": [{...}, ...],
@@ -34,116 +56,298 @@ async def submit_article(data: Dict[str, Any], token: str = Depends(verify_token
         "product_images": {product_index: [...]},
         "product_texts": {product_index: [...]}
     }
+
+    If article.workflow_uuid is already in staging (or was approved), nothing
+    is written and the existing staging article ID is returned with
+    "duplicate": true.
+
+    With ?async=true the submission is only validated and queued, and the
+    response is 202 Accepted with a job ID to poll at /jobs/{job_id}.
     """
+    # Validated straight from the request body, before any other work
     try:
-        # Insert products first
-        product_id_mapping = {}
-        for idx, product in enumerate(data.get("products", [])):
-            result = await StagingProductTable.insert(
-                StagingProductTable(
-                    name=product["name"],
-                    brand=product["brand"],
-                    category=product["category"],
-                    price=product["price"],
-                    description=product["description"],
-                    image_url=product["image_url"],
-                    specs=product.get("specs", {}),
-                    affiliate_links=product.get("affiliate_links", {}),
-                    created_at=datetime.now(),
-                )
-            ).run()
-            product_id_mapping[idx] = result[0]["staging_product_id"]
-
-            # Insert product images
-            for img in data.get("product_images", {}).get(str(idx), []):
-                await StagingProductImageTable.insert(
-                    StagingProductImageTable(
-                        staging_product_id=product_id_mapping[idx],
-                        image_url=img["url"],
-                        alt_text=img.get("alt_text"),
-                        sequence_order=img.get("sequence", 0),
-                        created_at=datetime.now(),
-                    )
-                ).run()
-
-            # Insert product texts
-            for txt in data.get("product_texts", {}).get(str(idx), []):
-                await StagingProductTextTable.insert(
-                    StagingProductTextTable(
-                        staging_product_id=product_id_mapping[idx],
-                        content=txt["content"],
-                        heading=txt.get("heading"),
-                        sequence_order=txt.get("sequence", 0),
-                        created_at=datetime.now(),
-                    )
-                ).run()
-
-        # Insert article
-        article_data = data["article"]
-        article_result = await StagingArticleTable.insert(
-            StagingArticleTable(
-                title=article_data["title"],
-                category=article_data["category"],
-                author_name=article_data.get("author_name"),
-                top_pick_staging_id=product_id_mapping[article_data["top_pick_index"]],
-                runner_up_staging_id=product_id_mapping.get(
-                    article_data.get("runner_up_index")
-                ),
-                budget_pick_staging_id=product_id_mapping.get(
-                    article_data.get("budget_pick_index")
-                ),
-                status="pending",
-                submitted_at=datetime.now(),
-                created_at=datetime.now(),
-            )
-        ).run()
-
-        article_id = article_result[0]["staging_article_id"]
-
-        # Insert article images
-        for img in data.get("article_images", []):
-            await StagingArticleImageTable.insert(
-                StagingArticleImageTable(
-                    staging_article_id=article_id,
-                    image_url=img["url"],
-                    alt_text=img.get("alt_text"),
-                    image_type=img["type"],
-                    sequence_order=img.get("sequence", 0),
-                    created_at=datetime.now(),
-                )
-            ).run()
-
-        # Insert article texts
-        for txt in data.get("article_texts", []):
-            await StagingArticleTextTable.insert(
-                StagingArticleTextTable(
-                    staging_article_id=article_id,
-                    content=txt["content"],
-                    section_type=txt["type"],
-                    sequence_order=txt.get("sequence", 0),
-                    created_at=datetime.now(),
-                )
-            ).run()
-
-        return {
+        submission = parse_payload(ArticleSubmission, await request.body())
+    except InvalidPayload as e:
+        raise HTTPException(status_code=400, detail=f"Invalid submission: {e}")
+
+    if async_mode:
+        return await submit_article_async(submission)
+
+    with observe_stage("db_write"):
+        result = (await ingest_articles([normalize_api_submission(submission)]))[0]
+    count_ingest_results("api", [result])
+
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["error"])
+    if result.get("duplicate"):
+        return duplicate_response(result["staging_article_id"])
+
+    return {
+        "success": True,
+        "staging_article_id": result["staging_article_id"],
+        "message": "Article submitted to staging successfully",
+    }
+
+
+async def submit_article_async(submission: ArticleSubmission) -> JSONResponse:
+    """Queue a validated submission as a job"""
+
+    try:
+        job_id = await enqueue_job(submission)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Failed to queue submission: {e}")
+
+    return JSONResponse(
+        status_code=202,
+        content={
             "success": True,
-            "staging_article_id": article_id,
-            "message": "Article submitted to staging successfully",
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"{router.prefix}/jobs/{job_id}",
+        },
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def get_submit_job(job_id: str, token: str = Depends(verify_token)):
+    """
+    Get the status of an asynchronous submit job.
+
+    Status is one of "queued", "running", "succeeded" or "failed". Succeeded
+    jobs include "staging_article_id" (and "duplicate"), failed ones "error".
+    """
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/submit/batch")
+async def submit_article_batch(request: Request, token: str = Depends(verify_token)):
+    """
+    Submit many articles from the AI pipeline in one request.
+
+    Expected data structure:
+    {
+        "articles": [<submission as for /submit>, ...]
+    }
+
+    All valid articles are written in a single transaction. The response has
+    one result per submitted article, in the same order:
+    {"success": true, "staging_article_id": ..., "duplicate": true?} or
+    {"success": false, "error": "..."}.
+    """
+    try:
+        data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+
+    articles = data.get("articles") if isinstance(data, dict) else None
+    if not isinstance(articles, list):
+        raise HTTPException(status_code=400, detail="'articles' must be a list")
+    if len(articles) > SUBMIT_BATCH_MAX_ARTICLES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large (max {SUBMIT_BATCH_MAX_ARTICLES} articles)",
+        )
+
+    with observe_stage("db_write"):
+        results = await submit_batch(articles)
+
+    count_ingest_results("api", results)
+
+    succeeded = sum(1 for result in results if result["success"])
+    return {
+        "success": succeeded == len(results),
+        "submitted": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results,
+    }
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose content may still be reading the request body.
+
+    Starlette's StreamingResponse listens for client disconnects on
+    `receive` while streaming, which would consume the request body chunks
+    the content generator is reading.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+@router.post("/submit/stream")
+async def submit_article_stream(request: Request, token: str = Depends(verify_token)):
+    """
+    Submit articles as newline-delimited JSON, one submission (as for
+    /submit) per line.
+
+    The body is read incrementally and committed every
+    SUBMIT_STREAM_CHUNK_SIZE records, so memory use does not grow with the
+    upload. The response streams one NDJSON status line per record as its
+    chunk commits:
+    {"line": 1, "success": true, "staging_article_id": ...}
+    followed by a final {"done": true, "records": ..., "succeeded": ..., "failed": ...}.
+    """
+
+    async def results():
+        records = 0
+        succeeded = 0
+        async for result in submit_stream(request.stream()):
+            count_ingest_results("api", [result])
+            records += 1
+            succeeded += result["success"]
+            yield orjson.dumps(result) + b"\n"
+
+        summary = {
+            "done": True,
+            "records": records,
+            "succeeded": succeeded,
+            "failed": records - succeeded,
         }
+        yield orjson.dumps(summary) + b"\n"
+
+    return BodyStreamingResponse(results(), media_type="application/x-ndjson")
 
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+
+def duplicate_response(article_id: int) -> Dict[str, Any]:
+    """Response for a submission whose workflow_uuid was already submitted"""
+    return {
+        "success": True,
+        "staging_article_id": article_id,
+        "duplicate": True,
+        "message": "Article already submitted",
+    }
 
 
 @router.get("/rejections")
-async def get_rejections(token: str = Depends(verify_token)):
+async def get_rejections(
+    wait: float = Query(0, ge=0, le=REJECTION_WAIT_MAX),
+    fields: Optional[str] = Query(None),
+    token: str = Depends(verify_token),
+):
     """
     Get pending rejections for AI pipeline to process.
+
+    Each item has rejection_id, staging_article_id, workflow_uuid,
+    reviewer_comments and rejected_at. ?fields=a,b selects other
+    rejection_queue columns instead; the full article snapshot is fetched
+    per rejection from /rejections/{rejection_id}/snapshot (or listed with
+    fields=...,article_data).
+
+    With ?wait=N (seconds) and nothing pending, the request is held until a
+    new rejection arrives or N seconds pass, instead of answering [] at once.
     """
-    rejections = await get_pending_rejections()
+    columns = parse_rejection_fields(fields)
+
+    async def pending():
+        return await get_pending_rejections(columns)
+
+    if wait:
+        return await wait_for_rejections(wait, fetch=pending)
+
+    rejections = await pending()
     return rejections
 
 
+@router.post("/rejections/claim")
+async def claim_pending_rejections(
+    worker: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=REJECTION_CLAIM_MAX),
+    lease: int = Query(REJECTION_LEASE_SECONDS, ge=1, le=24 * 3600),
+    wait: float = Query(0, ge=0, le=REJECTION_WAIT_MAX),
+    fields: Optional[str] = Query(None),
+    token: str = Depends(verify_token),
+):
+    """
+    Claim up to `limit` pending rejections for one pipeline worker.
+
+    Items have the same fields as GET /rejections (see ?fields=).
+
+    Claimed rejections are leased to `worker` for `lease` seconds and are
+    not returned to other workers meanwhile; ack them when done. If the
+    lease expires first they can be claimed again. With ?wait=N the request
+    is held until something can be claimed or N seconds pass.
+    """
+
+    columns = parse_rejection_fields(fields)
+
+    async def claim():
+        return await claim_rejections(worker, limit, lease, columns)
+
+    if wait:
+        return await wait_for_rejections(wait, fetch=claim)
+    return await claim()
+
+
+@router.get("/rejections/{rejection_id}/snapshot")
+async def get_rejection_article_snapshot(
+    rejection_id: int, request: Request, token: str = Depends(verify_token)
+):
+    """
+    Get the full article snapshot (article_data) of a rejection.
+
+    The response carries an ETag; send it back in If-None-Match to get
+    304 Not Modified instead of downloading the snapshot again.
+    """
+    snapshot = await get_rejection_snapshot(rejection_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Rejection not found")
+
+    etag = f'"{snapshot["etag"]}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return StreamingResponse(
+        iter_rejection_snapshot(rejection_id),
+        media_type="application/json",
+        headers={"ETag": etag, "Content-Length": str(snapshot["size"])},
+    )
+
+
+def parse_rejection_fields(fields: Optional[str]) -> List[str]:
+    """Parse ?fields=, answering 400 for unknown fields"""
+    try:
+        return rejection_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header matches `etag` (weak comparison)"""
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags
+
+
+@router.post("/rejections/ack")
+async def acknowledge_rejections(
+    request: RejectionAckRequest, token: str = Depends(verify_token)
+):
+    """
+    Mark many rejections as processed by AI pipeline in one request.
+
+    Expected data structure:
+    {
+        "rejection_ids": [1, 2, 3]
+    }
+
+    "acked" lists the IDs that were found and marked, "not_found" the rest.
+    """
+    acked = await mark_rejections_processed(request.rejection_ids)
+    found = set(acked)
+    not_found = sorted(set(request.rejection_ids) - found)
+
+    return {"success": not not_found, "acked": acked, "not_found": not_found}
+
+
 @router.post("/rejections/{rejection_id}/ack")
 async def acknowledge_rejection(rejection_id: int, token: str = Depends(verify_token)):
     """
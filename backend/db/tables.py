@@ -14,6 +14,13 @@ from piccolo.columns import (
     Integer,
     Boolean,
 )
+from piccolo.columns.combination import WhereRaw
+
+# Hot queue predicates, written as literals rather than query parameters so
+# the planner can always match their partial indexes (a cached generic plan
+# with "status = $1" cannot use an index on "WHERE status = 'pending'")
+PENDING_ARTICLES = WhereRaw("status = 'pending'")
+PENDING_REJECTIONS = WhereRaw("processed_by_pipeline = FALSE")
 
 
 class StagingProductTable(Table, schema="staging", tablename="staging_product"):
@@ -31,6 +38,9 @@ class StagingProductTable(Table, schema="staging", tablename="staging_product"):
     specs = JSONB(default={})
     affiliate_links = JSONB(default={})
 
+    # Identifies the product across staging articles (see services/products.py)
+    fingerprint = Varchar(length=64, null=True, index=True)
+
     # Link to staging article (optional, for tracking)
     staging_article_id = Integer(null=True)
 
@@ -47,8 +57,8 @@ class StagingArticleTable(Table, schema="staging", tablename="staging_article"):
 
     # Workflow tracking (links to provenpick-workflow)
     workflow_uuid = Varchar(
-        length=36, null=True, index=True
-    )  # UUID from workflow system
+        length=36, null=True, unique=True
+    )  # UUID from workflow system, one staging article per UUID
 
     # Article information (same as main ArticleTable)
     title = Varchar(length=255)
@@ -154,6 +164,10 @@ class RejectionQueueTable(Table, schema="staging", tablename="rejection_queue"):
     processed_by_pipeline = Boolean(default=False)
     processed_at = Timestamp(null=True)
 
+    # Claim by a pipeline worker (see /api/pipeline/rejections/claim)
+    lease_owner = Varchar(length=100, null=True)
+    lease_expires_at = Timestamp(null=True)
+
     def __str__(self):
         status = "Processed" if self.processed_by_pipeline else "Pending"
         return f"Rejection {self.rejection_id} - {status}"
@@ -165,6 +179,8 @@ class ArchiveTable(Table, schema="staging", tablename="archive"):
     archive_id = Serial(primary_key=True)
     staging_article_id = Integer()
     action = Varchar(length=20)  # 'approved' or 'rejected'
+    # Approved UUIDs are treated as duplicates if the workflow resubmits them
+    workflow_uuid = Varchar(length=36, null=True)
     article_data = JSONB()  # Complete snapshot of article + products + child data
     reviewer_comments = Text(null=True)
     archived_at = Timestamp()
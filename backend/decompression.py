@@ -0,0 +1,186 @@
+"""
+Request body decompression.
+
+Pipeline submissions carry full article HTML, mermaid source and sometimes
+base64 images, which compress 5-10x. Clients may send them with
+`Content-Encoding: gzip` or `zstd` and the body is decompressed as it is
+received, so handlers (including the streaming submit endpoint) see plain
+JSON. zstd needs the optional `zstandard` package.
+
+Decompressed bodies larger than REQUEST_MAX_DECOMPRESSED_BYTES are refused
+with 413, which also protects against decompression bombs.
+"""
+
+import json
+import os
+import zlib
+from typing import Optional
+
+from starlette.requests import ClientDisconnect
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+REQUEST_MAX_DECOMPRESSED_BYTES = int(
+    os.getenv("REQUEST_MAX_DECOMPRESSED_BYTES", str(100 * 1024 * 1024))
+)
+
+# zstd input is fed in slices this size so a single highly compressed chunk
+# cannot expand far past the limit before it is checked
+ZSTD_INPUT_SLICE = 256
+
+
+class GzipDecoder:
+    def __init__(self):
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        """Decompress `data`, returning at most `max_length` bytes"""
+        return self._decompressor.decompress(data, max_length)
+
+    def flush(self) -> bytes:
+        if not self._decompressor.eof:
+            raise ValueError("Truncated gzip body")
+        return b""
+
+
+class ZstdDecoder:
+    def __init__(self):
+        self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        """Decompress `data`, stopping once more than `max_length` bytes are out"""
+        output = bytearray()
+        for start in range(0, len(data), ZSTD_INPUT_SLICE):
+            output += self._decompressor.decompress(
+                data[start : start + ZSTD_INPUT_SLICE]
+            )
+            if len(output) >= max_length:
+                break
+        return bytes(output)
+
+    def flush(self) -> bytes:
+        if not self._decompressor.eof:
+            raise ValueError("Truncated zstd body")
+        return b""
+
+
+DECODERS = {"gzip": GzipDecoder, "x-gzip": GzipDecoder}
+# Exceptions meaning the compressed body is malformed (400)
+DECODE_ERRORS: tuple = (zlib.error, ValueError)
+if zstandard is not None:
+    DECODERS["zstd"] = ZstdDecoder
+    DECODE_ERRORS += (zstandard.ZstdError,)
+
+
+class RequestDecompressionMiddleware:
+    """
+    ASGI middleware decompressing gzip/zstd request bodies.
+
+    Requests with an unsupported Content-Encoding get 415, malformed
+    compressed bodies 400 and bodies that decompress past `max_size` 413.
+    """
+
+    def __init__(self, app, max_size: int = REQUEST_MAX_DECOMPRESSED_BYTES):
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        headers = []
+        for name, value in scope["headers"]:
+            if name == b"content-encoding":
+                encoding = value.decode("latin-1").strip().lower()
+            elif name != b"content-length":
+                headers.append((name, value))
+
+        if encoding in (None, "", "identity"):
+            await self.app(scope, receive, send)
+            return
+
+        decoder_class = DECODERS.get(encoding)
+        if decoder_class is None:
+            await send_error(send, 415, f"Unsupported Content-Encoding: {encoding}")
+            return
+
+        # The app sees a plain body of unknown length
+        scope = dict(scope, headers=headers)
+
+        decoder = decoder_class()
+        size = 0
+        error: Optional[tuple] = None
+        response_started = False
+        error_sent = False
+
+        async def decompressed_receive():
+            nonlocal size, error, error_sent
+
+            if error is not None:
+                return {"type": "http.disconnect"}
+
+            message = await receive()
+            if message["type"] != "http.request":
+                return message
+
+            more_body = message.get("more_body", False)
+            try:
+                body = decoder.decompress(
+                    message.get("body", b""), self.max_size - size + 1
+                )
+                size += len(body)
+                if size > self.max_size:
+                    error = (413, f"Decompressed body exceeds {self.max_size} bytes")
+                elif not more_body:
+                    body += decoder.flush()
+            except DECODE_ERRORS as e:
+                error = (400, f"Invalid {encoding} body: {e}")
+
+            if error is not None:
+                # Answer now and make the app stop reading
+                if not response_started:
+                    await send_error(send, *error)
+                    error_sent = True
+                return {"type": "http.disconnect"}
+
+            return {
+                "type": "http.request",
+                "body": body,
+                "more_body": more_body,
+            }
+
+        async def guarded_send(message):
+            nonlocal response_started
+
+            if error_sent:
+                return  # The app's response is replaced by the error
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, decompressed_receive, guarded_send)
+        except ClientDisconnect:
+            if not error_sent:
+                raise
+
+
+async def send_error(send, status: int, detail: str):
+    """Send a JSON error response in the same shape as HTTPException's"""
+    body = json.dumps({"detail": detail}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -2,11 +2,30 @@
 Main FastAPI application entry point.
 """
 
+import logging
 import os
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from backend.api import articles, pipeline, archive
+from backend.api import articles, pipeline, archive, blobs, events
+from backend.db.production import (
+    close_production_pool,
+    get_production_pool,
+    start_production_pool,
+)
+from backend.db.tables import StagingArticleTable
+from backend.decompression import RequestDecompressionMiddleware
+from backend.metrics import (
+    CONTENT_TYPE_LATEST,
+    refresh_queue_depths,
+    register_pool,
+    render_metrics,
+)
+from backend.services.jobs import JobRunner
+from backend.services.events import broker
+from backend.services.notifications import EVENTS_CHANNEL, listener
+from backend.services.redis_pool import close_redis, get_redis, start_redis
 
 # Load environment variables (dotenv is optional)
 try:
@@ -16,11 +35,46 @@ try:
 except ImportError:
     pass  # dotenv not installed, use system environment variables
 
+logger = logging.getLogger(__name__)
+
+# Staging DB connections held by the API (asyncpg opens min_size up front)
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the staging/production DB and Redis pools, submit job workers and LISTEN"""
+    engine = StagingArticleTable._meta.db
+    await engine.start_connection_pool(
+        min_size=min(DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE), max_size=DB_POOL_MAX_SIZE
+    )
+    register_pool("staging", lambda: engine.pool)
+    await start_production_pool()
+    register_pool("production", get_production_pool)
+    await start_redis()
+
+    jobs = JobRunner()
+    await jobs.start()
+    listener.add_handler(EVENTS_CHANNEL, broker.dispatch)
+    await listener.start()
+
+    yield
+
+    broker.close()
+    await listener.close()
+    await jobs.close()
+    await close_redis()
+    await close_production_pool()
+    await engine.close_connection_pool()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="ProvenPick Staging API",
     description="Content staging and moderation system for ProvenPick",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -32,10 +86,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/zstd request bodies (pipeline submissions)
+app.add_middleware(RequestDecompressionMiddleware)
+
 # Include routers
 app.include_router(articles.router)
 app.include_router(pipeline.router)
 app.include_router(archive.router)
+app.include_router(blobs.router)
+app.include_router(events.router)
 
 
 @app.get("/")
@@ -49,11 +108,9 @@ async def health():
     """Detailed health check"""
     try:
         # Test database connection using Piccolo
-        from backend.db.tables import StagingArticleTable
+        from backend.db.tables import PENDING_ARTICLES, StagingArticleTable
 
-        result = await StagingArticleTable.count().where(
-            StagingArticleTable.status == "pending"
-        )
+        result = await StagingArticleTable.count().where(PENDING_ARTICLES)
 
         return {
             "status": "healthy",
@@ -64,6 +121,17 @@ async def health():
         return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    try:
+        await refresh_queue_depths(get_redis())
+    except Exception as e:
+        logger.warning(f"Failed to read queue depths: {e}")
+
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,167 @@
+"""
+Prometheus metrics for the staging API and the queue consumer.
+
+The API exposes them at /metrics; the consumer serves them on a sidecar
+port (CONSUMER_METRICS_PORT).
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    start_http_server,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+INGEST_MESSAGES = Counter(
+    "staging_ingest_messages_total",
+    "Articles received for ingestion",
+    ["source", "result"],  # source: consumer/api, result: success/duplicate/failed
+)
+
+STAGE_LATENCY = Histogram(
+    "staging_stage_duration_seconds",
+    "Time spent per processing stage",
+    ["stage"],  # parse, db_write, approve, reject, migrate, archive
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+QUEUE_DEPTH = Gauge(
+    "staging_queue_depth",
+    "Messages waiting in each queue",
+    ["queue"],  # submit, failed, retry, rejections, jobs
+)
+
+PIPELINE_QUEUED = Gauge(
+    "staging_pipeline_queued_batches",
+    "Batches waiting for each stage of the staged consumer",
+    ["stage"],  # decode, write
+)
+
+PIPELINE_BUSY = Gauge(
+    "staging_pipeline_busy_workers",
+    "Staged consumer workers currently processing a batch",
+    ["stage"],  # decode, write
+)
+
+EVENT_SUBSCRIBERS = Gauge(
+    "staging_event_subscribers",
+    "Clients connected to the /api/events stream",
+)
+
+EVENT_OVERFLOWS = Counter(
+    "staging_event_overflows_total",
+    "Event stream clients disconnected for falling too far behind",
+)
+
+
+class PoolCollector:
+    """Reports size and idle connections of registered asyncpg pools"""
+
+    def __init__(self):
+        self.pools: Dict[str, Callable[[], Optional[object]]] = {}
+
+    def collect(self):
+        family = GaugeMetricFamily(
+            "staging_db_pool_connections",
+            "Database pool connections",
+            labels=["pool", "state"],
+        )
+        for name, get_pool in self.pools.items():
+            pool = get_pool()
+            if pool is None:
+                continue
+            size = pool.get_size()
+            idle = pool.get_idle_size()
+            family.add_metric([name, "max"], pool.get_max_size())
+            family.add_metric([name, "open"], size)
+            family.add_metric([name, "in_use"], size - idle)
+            family.add_metric([name, "idle"], idle)
+        yield family
+
+
+_pool_collector = PoolCollector()
+REGISTRY.register(_pool_collector)
+
+
+def register_pool(name: str, get_pool: Callable[[], Optional[object]]):
+    """
+    Report an asyncpg pool's utilisation.
+
+    Args:
+        name: Pool label, e.g. "staging"
+        get_pool: Returns the pool, or None while it is not started
+    """
+    _pool_collector.pools[name] = get_pool
+
+
+def count_ingest_results(source: str, results: List[Dict[str, Any]]):
+    """
+    Count per-article ingest results.
+
+    Args:
+        source: "api" or "consumer"
+        results: Results from backend.services.ingest
+    """
+    for result in results:
+        if not result["success"]:
+            outcome = "failed"
+        elif result.get("duplicate"):
+            outcome = "duplicate"
+        else:
+            outcome = "success"
+        INGEST_MESSAGES.labels(source, outcome).inc()
+
+
+def observe_stage(stage: str):
+    """Context manager timing one processing stage"""
+    return STAGE_LATENCY.labels(stage).time()
+
+
+async def refresh_queue_depths(client):
+    """
+    Update queue depth gauges from Redis.
+
+    Args:
+        client: asyncio Redis client
+    """
+    from backend.services.jobs import SUBMIT_JOB_QUEUE
+    from backend.services.queue_backends import (
+        QUEUE_BACKEND,
+        SUBMIT_QUEUE,
+        submit_stream_key,
+    )
+    from backend.services.rejection import REDIS_REJECTION_QUEUE
+    from backend.services.retry import retry_key
+
+    async with client.pipeline(transaction=False) as pipe:
+        if QUEUE_BACKEND == "stream":
+            pipe.xlen(submit_stream_key(SUBMIT_QUEUE))
+        else:
+            pipe.llen(SUBMIT_QUEUE)
+        pipe.llen(f"{SUBMIT_QUEUE}:failed")
+        pipe.zcard(retry_key(SUBMIT_QUEUE))
+        pipe.llen(REDIS_REJECTION_QUEUE)
+        pipe.llen(SUBMIT_JOB_QUEUE)
+        submit, failed, retry, rejections, jobs = await pipe.execute()
+
+    QUEUE_DEPTH.labels("submit").set(submit)
+    QUEUE_DEPTH.labels("failed").set(failed)
+    QUEUE_DEPTH.labels("retry").set(retry)
+    QUEUE_DEPTH.labels("rejections").set(rejections)
+    QUEUE_DEPTH.labels("jobs").set(jobs)
+
+
+def render_metrics() -> bytes:
+    """Current metrics in Prometheus text format"""
+    return generate_latest(REGISTRY)
+
+
+def start_metrics_server(port: int):
+    """Serve /metrics on a sidecar port (for the consumer process)"""
+    start_http_server(port)
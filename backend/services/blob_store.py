@@ -0,0 +1,228 @@
+"""
+Content-addressed blob storage.
+
+Large payloads (mindmap images, big article HTML) are stored outside the
+staging tables, keyed by the SHA-256 of their bytes. Rows keep only a
+reference of the form "blob:sha256:<hex>", which the API serves from
+/api/blobs/<hex>.
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+# Load environment variables (dotenv is optional)
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+except ImportError:
+    pass
+
+BLOB_STORE_BACKEND = os.getenv("BLOB_STORE_BACKEND", "local")
+BLOB_STORE_PATH = os.getenv("BLOB_STORE_PATH", "data/blobs")
+# Text at or below this size stays inline in the row
+BLOB_INLINE_MAX_BYTES = int(os.getenv("BLOB_INLINE_MAX_BYTES", "16384"))
+
+BLOB_REF_PREFIX = "blob:sha256:"
+BLOB_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def make_blob_ref(key: str) -> str:
+    """Reference stored in a row in place of the blob's content"""
+    return f"{BLOB_REF_PREFIX}{key}"
+
+
+def parse_blob_ref(value: Optional[str]) -> Optional[str]:
+    """Blob key of a reference, or None if the value is not a reference"""
+    if isinstance(value, str) and value.startswith(BLOB_REF_PREFIX):
+        key = value[len(BLOB_REF_PREFIX) :]
+        if BLOB_KEY_PATTERN.match(key):
+            return key
+    return None
+
+
+class BlobStore(ABC):
+    """Interface for blob storage backends"""
+
+    @abstractmethod
+    async def put(self, data: bytes, content_type: str) -> str:
+        """
+        Store a blob.
+
+        Args:
+            data: Blob content
+            content_type: MIME type served with the blob
+
+        Returns:
+            Blob key (hex SHA-256 of the content)
+        """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Fetch a blob.
+
+        Args:
+            key: Blob key
+
+        Returns:
+            (content, content_type), or None if the blob does not exist
+        """
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Blob store on the local filesystem.
+
+    Blobs live at <root>/<key[:2]>/<key> with the content type in a
+    <key>.type sidecar. Identical content is only written once.
+    """
+
+    def __init__(self, root: str = BLOB_STORE_PATH):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def _write(self, key: str, data: bytes, content_type: str):
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        for target, payload in ((f"{path}.type", content_type.encode()), (path, data)):
+            # Write then rename so readers never see a partial blob; the
+            # temporary name is unique per call, not just per process
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp, target)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+
+    def _read(self, key: str) -> Optional[Tuple[bytes, str]]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            with open(f"{path}.type") as f:
+                content_type = f.read().strip()
+        except FileNotFoundError:
+            content_type = "application/octet-stream"
+
+        return data, content_type
+
+    async def put(self, data: bytes, content_type: str) -> str:
+        key = hashlib.sha256(data).hexdigest()
+        await asyncio.to_thread(self._write, key, data, content_type)
+        return key
+
+    async def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        if not BLOB_KEY_PATTERN.match(key):
+            return None
+        return await asyncio.to_thread(self._read, key)
+
+
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Get the blob store selected by BLOB_STORE_BACKEND"""
+    global _blob_store
+
+    if _blob_store is None:
+        if BLOB_STORE_BACKEND == "local":
+            _blob_store = LocalBlobStore()
+        else:
+            raise ValueError(f"Unknown blob store backend: {BLOB_STORE_BACKEND}")
+
+    return _blob_store
+
+
+async def store_text(text: str, content_type: str) -> str:
+    """
+    Move text above BLOB_INLINE_MAX_BYTES into the blob store.
+
+    Args:
+        text: Text to store
+        content_type: MIME type served with the blob (without a charset)
+
+    Returns:
+        A blob reference, or the text itself if it is small enough to keep inline
+    """
+    data = (text or "").encode("utf-8")
+    if len(data) <= BLOB_INLINE_MAX_BYTES:
+        return text
+
+    key = await get_blob_store().put(data, f"{content_type}; charset=utf-8")
+    return make_blob_ref(key)
+
+
+async def store_base64_image(image_b64: str, content_type: str = "image/png") -> str:
+    """
+    Store a base64-encoded image.
+
+    Args:
+        image_b64: Base64 image data (without a data: prefix)
+        content_type: Image MIME type
+
+    Returns:
+        Blob reference for the image
+    """
+    key = await get_blob_store().put(base64.b64decode(image_b64), content_type)
+    return make_blob_ref(key)
+
+
+async def store_image_url(url: str) -> str:
+    """
+    Move a data: URL image into the blob store; other URLs are returned as-is.
+
+    Args:
+        url: Image URL
+
+    Returns:
+        A blob reference for data: URLs, otherwise the original URL
+    """
+    if not url or not url.startswith("data:") or ";base64," not in url:
+        return url
+
+    header, image_b64 = url.split(",", 1)
+    content_type = header[len("data:") :].split(";", 1)[0] or "image/png"
+    return await store_base64_image(image_b64, content_type)
+
+
+async def resolve_text(value: str) -> str:
+    """Text content for a value that may be a blob reference"""
+    key = parse_blob_ref(value)
+    if key is None:
+        return value
+
+    blob = await get_blob_store().get(key)
+    if blob is None:
+        raise LookupError(f"Blob not found: {key}")
+    return blob[0].decode("utf-8")
+
+
+async def resolve_image_url(value: str) -> str:
+    """Self-contained image URL (data: URL) for a value that may be a blob reference"""
+    key = parse_blob_ref(value)
+    if key is None:
+        return value
+
+    blob = await get_blob_store().get(key)
+    if blob is None:
+        raise LookupError(f"Blob not found: {key}")
+    data, content_type = blob
+    return f"data:{content_type};base64,{base64.b64encode(data).decode('ascii')}"
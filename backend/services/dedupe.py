@@ -0,0 +1,118 @@
+"""
+Duplicate submission detection.
+
+Staging articles are unique on workflow_uuid. Ingest paths look submissions
+up here before writing, so retried or re-delivered messages are skipped
+instead of creating a second copy of the article. Approved articles are
+deleted from staging, so their UUIDs are also looked up in the archive; a
+rejected article may be resubmitted under the same UUID.
+
+recent_uuids remembers recently written UUIDs so consumers can spot likely
+re-deliveries before doing any work; a hit is confirmed with
+find_existing_articles before the message is dropped.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from backend.db.tables import ArchiveTable, StagingArticleTable
+
+RECENT_UUID_CACHE_SIZE = int(os.getenv("RECENT_UUID_CACHE_SIZE", "10000"))
+# Kept short: a rejected article is deleted from staging and the workflow may
+# legitimately resubmit it under the same UUID
+RECENT_UUID_TTL = int(os.getenv("RECENT_UUID_TTL", "300"))
+
+
+class RecentUUIDCache:
+    """Bounded, expiring map of recently ingested workflow_uuid -> staging ID"""
+
+    def __init__(self, maxsize: int = RECENT_UUID_CACHE_SIZE, ttl: int = RECENT_UUID_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, workflow_uuid: str) -> Optional[int]:
+        """Staging article ID for a recently seen UUID, if still fresh"""
+        entry = self._entries.get(workflow_uuid)
+        if entry is None:
+            return None
+
+        article_id, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[workflow_uuid]
+            return None
+        return article_id
+
+    def add(self, workflow_uuid: str, article_id: int):
+        """Remember a UUID that now exists in staging"""
+        self._entries[workflow_uuid] = (article_id, time.monotonic() + self.ttl)
+        self._entries.move_to_end(workflow_uuid)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, workflow_uuid: Optional[str]):
+        """Forget a UUID, e.g. once its staging article has been deleted"""
+        if workflow_uuid:
+            self._entries.pop(workflow_uuid, None)
+
+
+recent_uuids = RecentUUIDCache()
+
+
+async def find_existing_articles(workflow_uuids: Iterable[str]) -> Dict[str, int]:
+    """
+    Find articles that already exist for the given workflow UUIDs, in
+    staging or approved (archived).
+
+    Always answered from the database with a single query: the cache is
+    per process and is not told when another process (the API, on approval
+    or rejection) deletes an article, so a cache hit is only a hint. The
+    cache is refreshed with the result.
+
+    Args:
+        workflow_uuids: UUIDs to check (None/empty values are ignored)
+
+    Returns:
+        Mapping of existing workflow_uuid -> staging_article_id (the former
+        staging ID for approved articles)
+    """
+    wanted = list(set(u for u in workflow_uuids if u))
+    if not wanted:
+        return {}
+
+    rows = (
+        await StagingArticleTable.select(
+            StagingArticleTable.workflow_uuid,
+            StagingArticleTable.staging_article_id,
+        )
+        .where(StagingArticleTable.workflow_uuid.is_in(wanted))
+        .run()
+    )
+
+    existing = {row["workflow_uuid"]: row["staging_article_id"] for row in rows}
+
+    missing = [u for u in wanted if u not in existing]
+    if missing:
+        approved = (
+            await ArchiveTable.select(
+                ArchiveTable.workflow_uuid,
+                ArchiveTable.staging_article_id,
+            )
+            .where(
+                ArchiveTable.workflow_uuid.is_in(missing),
+                ArchiveTable.action == "approved",
+            )
+            .run()
+        )
+        for row in approved:
+            existing[row["workflow_uuid"]] = row["staging_article_id"]
+
+    for workflow_uuid in wanted:
+        if workflow_uuid in existing:
+            recent_uuids.add(workflow_uuid, existing[workflow_uuid])
+        else:
+            recent_uuids.discard(workflow_uuid)
+
+    return existing
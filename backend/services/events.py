@@ -0,0 +1,139 @@
+"""
+Staging state change events.
+
+Writers publish typed events (article_submitted, approved, rejected,
+rejection_acked) with Postgres NOTIFY, so events from every API worker and
+from the queue consumer reach every API process. Each API process receives
+them on the shared LISTEN connection and broadcasts them in-process to the
+clients connected to /api/events.
+
+Publishing never blocks on slow clients: each client has a bounded buffer,
+and a client whose buffer fills up is disconnected with an "overflow" event
+so it can reconnect and re-read current state.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from backend.db.tables import StagingArticleTable
+from backend.metrics import EVENT_OVERFLOWS, EVENT_SUBSCRIBERS
+from backend.services.notifications import EVENTS_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = ("article_submitted", "approved", "rejected", "rejection_acked")
+# Events buffered per client before it is disconnected as too slow
+EVENT_BUFFER_SIZE = int(os.getenv("EVENT_BUFFER_SIZE", "256"))
+
+# Ends a subscription (shutdown or overflow)
+CLOSED = None
+
+
+async def publish_events(events: List[Dict[str, Any]]):
+    """
+    Publish events to every API process.
+
+    Best effort: failures are logged, never raised, so publishing cannot
+    fail the write that caused the event.
+
+    Args:
+        events: Events, each with a "type" from EVENT_TYPES
+    """
+    if not events:
+        return
+
+    now = datetime.now().isoformat()
+    payloads = [json.dumps({**event, "at": now}, default=str) for event in events]
+    try:
+        # One round trip however many events there are
+        await StagingArticleTable.raw(
+            "SELECT pg_notify({}, payload) FROM unnest({}::text[]) AS payload",
+            EVENTS_CHANNEL,
+            payloads,
+        ).run()
+    except Exception as e:
+        logger.warning(f"Failed to publish {len(events)} event(s): {e}")
+
+
+class Subscription:
+    """One client's buffered event feed"""
+
+    def __init__(self, types: Optional[Set[str]], buffer_size: int):
+        self.types = types
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.overflowed = False
+
+    async def get(self) -> Optional[Dict[str, Any]]:
+        """Next event, or CLOSED once the subscription has ended"""
+        return await self.queue.get()
+
+
+class EventBroker:
+    """In-process broadcast of events to subscribed clients"""
+
+    def __init__(self, buffer_size: int = EVENT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.subscriptions: Set[Subscription] = set()
+
+    def subscribe(self, types: Optional[Set[str]] = None) -> Subscription:
+        """
+        Start receiving events.
+
+        Args:
+            types: Event types to receive (all if None)
+        """
+        subscription = Subscription(types, self.buffer_size)
+        self.subscriptions.add(subscription)
+        EVENT_SUBSCRIBERS.set(len(self.subscriptions))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscriptions.discard(subscription)
+        EVENT_SUBSCRIBERS.set(len(self.subscriptions))
+
+    def dispatch(self, payload: str):
+        """Broadcast an event received from NOTIFY (listener handler)"""
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring invalid event payload: {payload[:100]}")
+            return
+        self.broadcast(event)
+
+    def broadcast(self, event: Dict[str, Any]):
+        """Hand an event to every subscription without waiting"""
+        for subscription in list(self.subscriptions):
+            if subscription.types and event.get("type") not in subscription.types:
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._overflow(subscription)
+
+    def _overflow(self, subscription: Subscription):
+        """Disconnect a client that is not keeping up"""
+        self.unsubscribe(subscription)
+        subscription.overflowed = True
+        EVENT_OVERFLOWS.inc()
+
+        # Its buffered events are dropped; it re-reads state on reconnect
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(CLOSED)
+
+    def close(self):
+        """End every subscription (on shutdown)"""
+        for subscription in list(self.subscriptions):
+            self.unsubscribe(subscription)
+            try:
+                subscription.queue.put_nowait(CLOSED)
+            except asyncio.QueueFull:
+                subscription.queue.get_nowait()
+                subscription.queue.put_nowait(CLOSED)
+
+
+broker = EventBroker()
@@ -0,0 +1,852 @@
+"""
+Ingestion of articles into staging.
+
+Both entry points, the pipeline API (/api/pipeline/submit*) and the
+workflow queue consumer, validate their payloads against the typed schemas
+in shared.models (straight from the raw JSON, before any database work),
+normalize them into NormalizedArticle and write them with the same bulk
+writer: one transaction per batch with one multi-row INSERT ... RETURNING
+per table, so the number of statements does not grow with the number of
+articles, products, images or texts.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type, TypeVar
+
+import asyncpg
+from piccolo.table import Table
+from pydantic import BaseModel, ValidationError
+
+from backend.db.tables import (
+    StagingArticleTable,
+    StagingProductTable,
+    StagingArticleImageTable,
+    StagingArticleTextTable,
+    StagingProductImageTable,
+    StagingProductTextTable,
+)
+from backend.services.blob_store import store_image_url, store_text
+from backend.services.dedupe import find_existing_articles, recent_uuids
+from backend.services.events import publish_events
+from backend.services.products import product_fingerprint
+from shared.models import (
+    ArticleSubmission,
+    WorkflowContent,
+    WorkflowProduct,
+    WorkflowSubmitMessage,
+)
+
+logger = logging.getLogger(__name__)
+
+# Largest batch accepted by /api/pipeline/submit/batch
+SUBMIT_BATCH_MAX_ARTICLES = int(os.getenv("SUBMIT_BATCH_MAX_ARTICLES", "1000"))
+# Streaming submits are committed every SUBMIT_STREAM_CHUNK_SIZE records
+SUBMIT_STREAM_CHUNK_SIZE = int(os.getenv("SUBMIT_STREAM_CHUNK_SIZE", "100"))
+# Longest single NDJSON record accepted by /api/pipeline/submit/stream
+SUBMIT_STREAM_MAX_RECORD_BYTES = int(
+    os.getenv("SUBMIT_STREAM_MAX_RECORD_BYTES", str(16 * 1024 * 1024))
+)
+
+# Workflow pick types -> staging article pick columns
+WORKFLOW_PICK_COLUMNS = {
+    "top_pick": "top_pick",
+    "value_pick": "runner_up",
+    "budget_pick": "budget_pick",
+}
+
+# MIME types of article text sections moved to the blob store; anything
+# else is HTML
+TEXT_CONTENT_TYPES = {
+    "bullet_points": "application/json",
+    "mindmap_summary": "text/plain",
+}
+
+# Validation errors listed in an InvalidPayload message
+MAX_REPORTED_ERRORS = 5
+
+# Most bound parameters Postgres (and asyncpg) accepts in one statement
+MAX_QUERY_PARAMETERS = 32767
+
+# Errors that may go away on retry: the database (or its network) is down
+# or out of connections, as opposed to a problem with the article itself
+TRANSIENT_ERRORS = (
+    asyncpg.PostgresConnectionError,
+    asyncpg.InterfaceError,
+    asyncpg.exceptions.CannotConnectNowError,
+    asyncpg.exceptions.TooManyConnectionsError,
+    ConnectionError,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+Payload = TypeVar("Payload", bound=BaseModel)
+
+
+class InvalidPayload(ValueError):
+    """A submission that is not valid JSON or does not match its schema"""
+
+
+@dataclass
+class NormalizedArticle:
+    """One article and its child rows, independent of the submission format"""
+
+    workflow_uuid: Optional[str]
+    # StagingArticleTable values: title, category, author_name
+    article: Dict[str, Any]
+    # StagingProductTable values, plus per-product image and text rows
+    products: List[Dict[str, Any]] = field(default_factory=list)
+    product_images: List[List[Dict[str, Any]]] = field(default_factory=list)
+    product_texts: List[List[Dict[str, Any]]] = field(default_factory=list)
+    article_images: List[Dict[str, Any]] = field(default_factory=list)
+    article_texts: List[Dict[str, Any]] = field(default_factory=list)
+    # Pick column -> index into products (None if not set)
+    picks: Dict[str, Optional[int]] = field(default_factory=dict)
+
+
+def parse_payload(model: Type[Payload], raw: Any) -> Payload:
+    """
+    Validate a payload against its schema.
+
+    Raw JSON (bytes or str) is parsed and validated in one pass by
+    pydantic-core, without building an intermediate dict.
+
+    Args:
+        model: Schema from shared.models
+        raw: JSON bytes/str, an already decoded dict, or a model instance
+
+    Returns:
+        Validated model instance
+
+    Raises:
+        InvalidPayload: If the payload is not valid JSON or does not match
+    """
+    if isinstance(raw, model):
+        return raw
+    try:
+        if isinstance(raw, (bytes, bytearray, str)):
+            return model.model_validate_json(raw)
+        return model.model_validate(raw)
+    except ValidationError as e:
+        raise InvalidPayload(describe_validation_error(e)) from None
+
+
+def describe_validation_error(error: ValidationError) -> str:
+    """Short "location: message" summary of a ValidationError"""
+    errors = error.errors(include_url=False, include_input=False)
+    parts = [
+        f"{'.'.join(str(loc) for loc in e['loc']) or 'payload'}: {e['msg']}"
+        for e in errors[:MAX_REPORTED_ERRORS]
+    ]
+    if len(errors) > MAX_REPORTED_ERRORS:
+        parts.append(f"and {len(errors) - MAX_REPORTED_ERRORS} more error(s)")
+    return "; ".join(parts)
+
+
+def decode_api_submission(raw: Any) -> NormalizedArticle:
+    """
+    Validate a pipeline API submission and normalize it.
+
+    Args:
+        raw: Submission (see /api/pipeline/submit) as JSON, dict or
+            ArticleSubmission
+
+    Returns:
+        Normalized article
+
+    Raises:
+        InvalidPayload: If the submission is invalid
+    """
+    return normalize_api_submission(parse_payload(ArticleSubmission, raw))
+
+
+def decode_workflow_message(raw: Any) -> NormalizedArticle:
+    """
+    Validate a workflow submit message and normalize it.
+
+    Args:
+        raw: Message from the workflow submit queue, as JSON or dict
+
+    Returns:
+        Normalized article
+
+    Raises:
+        InvalidPayload: If the message is invalid
+    """
+    return normalize_workflow_message(parse_payload(WorkflowSubmitMessage, raw))
+
+
+def normalize_api_submission(submission: ArticleSubmission) -> NormalizedArticle:
+    """
+    Normalize a validated pipeline API submission.
+
+    Args:
+        submission: Validated submission
+
+    Returns:
+        Normalized article
+    """
+    article = submission.article
+
+    normalized = NormalizedArticle(
+        workflow_uuid=article.workflow_uuid,
+        article={
+            "title": article.title,
+            "category": article.category,
+            "author_name": article.author_name,
+        },
+        picks={
+            "top_pick": article.top_pick_index,
+            "runner_up": article.runner_up_index,
+            "budget_pick": article.budget_pick_index,
+        },
+    )
+
+    for idx, product in enumerate(submission.products):
+        normalized.products.append(product.model_dump())
+        normalized.product_images.append(
+            [
+                {
+                    "image_url": img.url,
+                    "alt_text": img.alt_text,
+                    "sequence_order": img.sequence,
+                }
+                for img in submission.product_images.get(idx, [])
+            ]
+        )
+        normalized.product_texts.append(
+            [
+                {
+                    "content": txt.content,
+                    "heading": txt.heading,
+                    "sequence_order": txt.sequence,
+                }
+                for txt in submission.product_texts.get(idx, [])
+            ]
+        )
+
+    for img in submission.article_images:
+        normalized.article_images.append(
+            {
+                "image_url": img.url,
+                "alt_text": img.alt_text,
+                "image_type": img.type,
+                "sequence_order": img.sequence,
+            }
+        )
+
+    for txt in submission.article_texts:
+        normalized.article_texts.append(
+            {
+                "content": txt.content,
+                "section_type": txt.type,
+                "sequence_order": txt.sequence,
+            }
+        )
+
+    return normalized
+
+
+def normalize_workflow_message(message: WorkflowSubmitMessage) -> NormalizedArticle:
+    """
+    Normalize a validated workflow submit message.
+
+    Args:
+        message: Validated message from the workflow submit queue
+
+    Returns:
+        Normalized article
+    """
+    products = message.products
+    category = str(message.l3_category_id)
+
+    normalized = NormalizedArticle(
+        workflow_uuid=message.article_uuid,
+        article={
+            # Use the catchy title from workflow, fallback to placeholder
+            "title": message.title or f"Review: Category {category}",
+            "category": category,
+        },
+        products=[build_product_fields(product, category) for product in products],
+        product_images=[[] for _ in products],
+        product_texts=[[] for _ in products],
+        article_texts=build_article_sections(message.content),
+        picks=resolve_pick_indexes(products),
+    )
+
+    if message.content and message.content.mindmap_image:
+        normalized.article_images.append(
+            {
+                "image_url": f"data:image/png;base64,{message.content.mindmap_image}",
+                "alt_text": "Buying Guide Mindmap",
+                "image_type": "mindmap",
+                "sequence_order": 0,
+            }
+        )
+
+    return normalized
+
+
+def build_article_sections(content: Optional[WorkflowContent]) -> List[Dict[str, Any]]:
+    """
+    Build the article text sections stored for a workflow submission.
+
+    Args:
+        content: The "content" object from the workflow message
+
+    Returns:
+        List of {"section_type", "content", "sequence_order"} dicts
+    """
+    if not content:
+        return []
+
+    sections = [
+        {
+            "section_type": "full_article",
+            "content": content.full_article_html,
+            "sequence_order": 0,
+        }
+    ]
+
+    if content.bullet_points:
+        sections.append(
+            {
+                "section_type": "bullet_points",
+                "content": json.dumps(content.bullet_points),
+                "sequence_order": 1,
+            }
+        )
+
+    if content.mindmap_mermaid:
+        sections.append(
+            {
+                "section_type": "mindmap_summary",
+                "content": content.mindmap_mermaid,
+                "sequence_order": 2,
+            }
+        )
+
+    # Introduction section (displayed above mindmap)
+    if content.introduction:
+        sections.append(
+            {
+                "section_type": "introduction",
+                "content": content.introduction,
+                "sequence_order": 3,
+            }
+        )
+
+    return sections
+
+
+def build_product_fields(product: WorkflowProduct, category: str) -> Dict[str, Any]:
+    """
+    Map a workflow product onto StagingProductTable column values.
+
+    Args:
+        product: Product from the workflow message
+        category: Category stored on the product row
+
+    Returns:
+        Column values for StagingProductTable (without staging_article_id)
+    """
+    # Build description from available info
+    description = (
+        product.best_for
+        or product.pick_label
+        or product.target_persona
+        or "General purpose"
+    )
+
+    # Store pick_type and pick_label in specs
+    specs = dict(product.specs) if isinstance(product.specs, dict) else {}
+    specs["pick_type"] = product.pick_type
+    specs["pick_label"] = product.pick_label
+    specs["target_persona"] = product.target_persona
+    specs["best_for"] = product.best_for
+
+    return {
+        "name": product.name,
+        "brand": product.brand or "",
+        "category": category,
+        "price": product.price_inr or 0,  # Default to 0 if None
+        "description": description,  # Never None
+        "image_url": product.image_urls[0] if product.image_urls else "",
+        "specs": specs,
+        "affiliate_links": product.affiliate_links,
+    }
+
+
+def resolve_pick_indexes(products: List[WorkflowProduct]) -> Dict[str, Optional[int]]:
+    """
+    Resolve top/runner-up/budget picks from workflow product pick types.
+
+    Args:
+        products: Products from the workflow message
+
+    Returns:
+        Pick column -> product index (or None)
+    """
+    picks = {"top_pick": None, "runner_up": None, "budget_pick": None}
+
+    for idx, product in enumerate(products):
+        column = WORKFLOW_PICK_COLUMNS.get(product.pick_type or "")
+        if column and picks[column] is None:
+            picks[column] = idx
+
+    # Use first product as fallback for top_pick if none assigned
+    if picks["top_pick"] is None and products:
+        picks["top_pick"] = 0
+
+    return picks
+
+
+async def store_article_blobs(article: NormalizedArticle) -> NormalizedArticle:
+    """
+    Move inline (data: URL) images and large texts into the blob store.
+
+    Done before the write transaction opens, so nothing but inserts happens
+    inside it. Content that was already moved is left unchanged.
+
+    Args:
+        article: Normalized article, updated in place
+
+    Returns:
+        The same article
+    """
+    for image in article.article_images:
+        image["image_url"] = await store_image_url(image["image_url"])
+    for images in article.product_images:
+        for image in images:
+            image["image_url"] = await store_image_url(image["image_url"])
+    for text in article.article_texts:
+        content_type = TEXT_CONTENT_TYPES.get(text["section_type"], "text/html")
+        text["content"] = await store_text(text["content"], content_type)
+
+    return article
+
+
+async def update_pick_ids(picks: List[Tuple[int, Dict[str, Optional[int]]]]):
+    """
+    Set top/runner-up/budget pick IDs for many articles in one UPDATE.
+
+    Args:
+        picks: (staging article ID, {"top_pick", "runner_up", "budget_pick"})
+            pairs with staging product IDs
+    """
+    if not picks:
+        return
+
+    await StagingArticleTable.raw(
+        """
+        UPDATE staging.staging_article AS a
+        SET top_pick_staging_id = p.top_pick,
+            runner_up_staging_id = p.runner_up,
+            budget_pick_staging_id = p.budget_pick
+        FROM unnest({}::int[], {}::int[], {}::int[], {}::int[])
+            AS p(article_id, top_pick, runner_up, budget_pick)
+        WHERE a.staging_article_id = p.article_id
+        """,
+        [aid for aid, _ in picks],
+        [p["top_pick"] for _, p in picks],
+        [p["runner_up"] for _, p in picks],
+        [p["budget_pick"] for _, p in picks],
+    ).run()
+
+
+async def insert_rows(table: Type[Table], rows: List[Table]) -> List[Dict[str, Any]]:
+    """
+    Insert rows with as few multi-row INSERTs as the parameter limit allows.
+
+    Args:
+        table: Table class of the rows
+        rows: Row instances to insert
+
+    Returns:
+        The inserted rows' primary keys, in the same order as `rows`
+    """
+    per_statement = max(1, MAX_QUERY_PARAMETERS // len(table._meta.columns))
+    inserted = []
+    for start in range(0, len(rows), per_statement):
+        chunk = rows[start : start + per_statement]
+        inserted.extend(await table.insert(*chunk).run())
+    return inserted
+
+
+async def write_articles(articles: List[NormalizedArticle]) -> List[int]:
+    """
+    Write normalized articles in a single transaction.
+
+    Args:
+        articles: Normalized articles (with blobs already stored)
+
+    Returns:
+        Staging article IDs, in the same order as `articles`
+
+    Raises:
+        Exception: If any write fails (nothing is committed)
+    """
+    if not articles:
+        return []
+
+    now = datetime.now()
+
+    async with StagingArticleTable._meta.db.transaction():
+        # 1. Articles (pick IDs are set once products exist)
+        article_rows = await insert_rows(
+            StagingArticleTable,
+            [
+                StagingArticleTable(
+                    **article.article,
+                    workflow_uuid=article.workflow_uuid,
+                    top_pick_staging_id=0,
+                    status="pending",
+                    submitted_at=now,
+                    created_at=now,
+                    updated_at=now,
+                )
+                for article in articles
+            ],
+        )
+        article_ids = [row["staging_article_id"] for row in article_rows]
+
+        # 2. Products, linked to their article
+        products = [
+            StagingProductTable(
+                staging_article_id=article_id,
+                fingerprint=product_fingerprint(product),
+                created_at=now,
+                **product,
+            )
+            for article_id, article in zip(article_ids, articles)
+            for product in article.products
+        ]
+        product_ids = []
+        if products:
+            product_rows = await insert_rows(StagingProductTable, products)
+            product_ids = [row["staging_product_id"] for row in product_rows]
+
+        # 3. Child rows, now that every parent ID is known
+        product_images = []
+        product_texts = []
+        article_images = []
+        article_texts = []
+        picks = []
+        offset = 0
+        for article_id, article in zip(article_ids, articles):
+            ids = product_ids[offset : offset + len(article.products)]
+            offset += len(article.products)
+
+            for product_id, images, texts in zip(
+                ids, article.product_images, article.product_texts
+            ):
+                product_images.extend(
+                    StagingProductImageTable(
+                        staging_product_id=product_id, created_at=now, **image
+                    )
+                    for image in images
+                )
+                product_texts.extend(
+                    StagingProductTextTable(
+                        staging_product_id=product_id, created_at=now, **text
+                    )
+                    for text in texts
+                )
+
+            article_images.extend(
+                StagingArticleImageTable(
+                    staging_article_id=article_id, created_at=now, **image
+                )
+                for image in article.article_images
+            )
+            article_texts.extend(
+                StagingArticleTextTable(
+                    staging_article_id=article_id, created_at=now, **text
+                )
+                for text in article.article_texts
+            )
+
+            if article.picks.get("top_pick") is not None:
+                picks.append(
+                    (
+                        article_id,
+                        {
+                            column: ids[index] if index is not None else None
+                            for column, index in article.picks.items()
+                        },
+                    )
+                )
+
+        for table, rows in (
+            (StagingProductImageTable, product_images),
+            (StagingProductTextTable, product_texts),
+            (StagingArticleImageTable, article_images),
+            (StagingArticleTextTable, article_texts),
+        ):
+            if rows:
+                await insert_rows(table, rows)
+
+        # 4. Pick IDs for every article in one UPDATE
+        await update_pick_ids(picks)
+
+    return article_ids
+
+
+async def ingest_articles(articles: List[NormalizedArticle]) -> List[Dict[str, Any]]:
+    """
+    Write normalized articles into staging.
+
+    Articles whose workflow_uuid is already in staging or approved (or
+    earlier in the list) are not written again. The rest are written in one
+    transaction; if that fails they are retried one at a time so each
+    article gets its own result.
+
+    Args:
+        articles: Normalized articles
+
+    Returns:
+        Per-article results, in the same order as `articles`. Each has
+        "success" and either "staging_article_id" (plus "duplicate") or "error"
+        (plus "retryable" if the error is transient, see error_result).
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(articles)
+
+    try:
+        existing = await find_existing_articles(a.workflow_uuid for a in articles)
+    except Exception as e:
+        logger.error(f"Duplicate lookup failed: {e}")
+        return [error_result(e) for _ in articles]
+
+    pending: List[int] = []
+    first_index: Dict[str, int] = {}  # workflow_uuid -> first occurrence
+    for i, article in enumerate(articles):
+        workflow_uuid = article.workflow_uuid
+        if workflow_uuid in existing:
+            results[i] = duplicate_result(existing[workflow_uuid])
+        elif workflow_uuid not in first_index:
+            if workflow_uuid:
+                first_index[workflow_uuid] = i
+            pending.append(i)
+
+    # Large content goes to the blob store before the transaction opens
+    for i in list(pending):
+        try:
+            await store_article_blobs(articles[i])
+        except Exception as e:
+            # e.g. an undecodable inline image: only this article fails
+            workflow_uuid = articles[i].workflow_uuid
+            logger.error(f"Failed to store content of {workflow_uuid}: {e}")
+            results[i] = error_result(e)
+            pending.remove(i)
+
+    if len(pending) == 1:
+        results[pending[0]] = await ingest_one(articles[pending[0]])
+    elif pending:
+        try:
+            article_ids = await write_articles([articles[i] for i in pending])
+            for i, article_id in zip(pending, article_ids):
+                results[i] = {"success": True, "staging_article_id": article_id}
+        except Exception as e:
+            logger.warning(f"Batch write failed ({e}), retrying articles one at a time")
+            for i in pending:
+                results[i] = await ingest_one(articles[i])
+
+    for i, article in enumerate(articles):
+        if results[i] is None:
+            # Repeat of a workflow_uuid earlier in the list
+            first = results[first_index[article.workflow_uuid]]
+            if first["success"]:
+                results[i] = duplicate_result(first["staging_article_id"])
+            else:
+                results[i] = first
+
+    submitted = [i for i in pending if results[i]["success"]]
+    for i in submitted:
+        if articles[i].workflow_uuid:
+            recent_uuids.add(
+                articles[i].workflow_uuid, results[i]["staging_article_id"]
+            )
+
+    await publish_events(
+        [
+            {
+                "type": "article_submitted",
+                "staging_article_id": results[i]["staging_article_id"],
+                "workflow_uuid": articles[i].workflow_uuid,
+                "title": articles[i].article["title"],
+            }
+            for i in submitted
+            if not results[i].get("duplicate")
+        ]
+    )
+
+    return results
+
+
+async def ingest_one(article: NormalizedArticle) -> Dict[str, Any]:
+    """Write one normalized article in its own transaction"""
+    try:
+        article_id = (await write_articles([article]))[0]
+        return {"success": True, "staging_article_id": article_id}
+    except asyncpg.exceptions.UniqueViolationError:
+        # A concurrent submission with the same workflow_uuid won the race
+        existing = await find_existing_articles([article.workflow_uuid])
+        if article.workflow_uuid in existing:
+            return duplicate_result(existing[article.workflow_uuid])
+        return {"success": False, "error": "Duplicate submission"}
+    except Exception as e:
+        logger.error(f"Failed to write article {article.workflow_uuid}: {e}")
+        return error_result(e)
+
+
+def error_result(error: Exception) -> Dict[str, Any]:
+    """
+    Result for an article that could not be written.
+
+    "retryable" is set when the error is transient (TRANSIENT_ERRORS), so
+    callers can retry instead of failing the article for good.
+    """
+    result = {"success": False, "error": str(error)}
+    if isinstance(error, TRANSIENT_ERRORS):
+        result["retryable"] = True
+    return result
+
+
+def duplicate_result(article_id: int) -> Dict[str, Any]:
+    """Result for an article whose workflow_uuid was already submitted"""
+    return {"success": True, "staging_article_id": article_id, "duplicate": True}
+
+
+async def submit_batch(submissions: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Write a batch of pipeline API submissions into staging.
+
+    Every submission is validated before anything is written; the ones that
+    fail are reported without being written and the rest go through
+    ingest_articles.
+
+    Args:
+        submissions: Submissions (see /api/pipeline/submit) as JSON, dicts
+            or ArticleSubmission models
+
+    Returns:
+        Per-submission results, in the same order as `submissions`
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(submissions)
+    valid: List[Tuple[int, NormalizedArticle]] = []
+
+    for i, data in enumerate(submissions):
+        try:
+            valid.append((i, decode_api_submission(data)))
+        except InvalidPayload as e:
+            results[i] = {"success": False, "error": f"Invalid submission: {e}"}
+
+    ingested = await ingest_articles([article for _, article in valid])
+    for (i, _), result in zip(valid, ingested):
+        results[i] = result
+
+    return results
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = SUBMIT_STREAM_MAX_RECORD_BYTES
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a byte stream into newline-delimited records.
+
+    Only the current record is held in memory. A record longer than
+    `max_line_bytes` is skipped and reported as None.
+
+    Args:
+        chunks: Byte chunks, e.g. an HTTP request body stream
+        max_line_bytes: Longest accepted record
+
+    Yields:
+        (1-based line number, record bytes or None if too long); blank
+        lines are skipped
+    """
+    buffer = bytearray()
+    line_no = 0
+    oversized = False
+
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end == -1:
+                if not oversized:
+                    buffer += chunk[start:]
+                    if len(buffer) > max_line_bytes:
+                        oversized = True
+                        buffer.clear()
+                break
+
+            line_no += 1
+            if oversized:
+                yield line_no, None
+            else:
+                buffer += chunk[start:end]
+                if len(buffer) > max_line_bytes:
+                    yield line_no, None
+                elif buffer.strip():
+                    yield line_no, bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+
+    if oversized:
+        yield line_no + 1, None
+    elif buffer.strip():
+        yield line_no + 1, bytes(buffer)
+
+
+async def submit_stream(
+    chunks: AsyncIterator[bytes], chunk_size: int = SUBMIT_STREAM_CHUNK_SIZE
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Write NDJSON submissions from a byte stream, committing in chunks.
+
+    Every `chunk_size` records are written with submit_batch (one
+    transaction), so memory use depends on the chunk size rather than on
+    the size of the stream. Each record is validated straight from its
+    bytes; records that are not valid fail on their own.
+
+    Args:
+        chunks: Byte chunks of NDJSON submissions (see /api/pipeline/submit)
+        chunk_size: Records per transaction
+
+    Yields:
+        One result per record, in order, with its "line" number added
+    """
+    pending: List[Tuple[int, Any]] = []  # (line number, record bytes or error)
+
+    async def flush():
+        submissions = [data for _, data in pending if not isinstance(data, Exception)]
+        results = iter(await submit_batch(submissions)) if submissions else iter(())
+        for line_no, data in pending:
+            if isinstance(data, Exception):
+                yield {"line": line_no, "success": False, "error": str(data)}
+            else:
+                yield {"line": line_no, **next(results)}
+        pending.clear()
+
+    async for line_no, line in iter_ndjson_lines(chunks):
+        if line is None:
+            record = ValueError(
+                f"Record exceeds {SUBMIT_STREAM_MAX_RECORD_BYTES} bytes"
+            )
+        else:
+            record = line
+        pending.append((line_no, record))
+
+        if len(pending) >= chunk_size:
+            async for result in flush():
+                yield result
+
+    if pending:
+        async for result in flush():
+            yield result
@@ -0,0 +1,285 @@
+"""
+Asynchronous submit jobs.
+
+With /api/pipeline/submit?async=true the API only validates a submission,
+records a job and pushes it onto a durable Redis queue, then answers
+202 Accepted. Job workers running in the API process write queued
+submissions to staging in batches, and the job's status is kept in a Redis
+hash that /api/pipeline/jobs/{job_id} reads.
+
+Job states: queued -> running -> succeeded | failed. A job whose write hits
+an unexpected error (e.g. the database is down) goes back to "queued" and
+is retried with backoff by the RetryScheduler.
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from backend.services.ingest import submit_batch
+from backend.services.queue_backends import ReliableListQueueBackend
+from backend.services.redis_pool import get_redis
+from backend.services.retry import RetryScheduler, next_attempt
+from shared.models import ArticleSubmission, SubmitJobMessage
+
+logger = logging.getLogger(__name__)
+
+SUBMIT_JOB_QUEUE = os.getenv("SUBMIT_JOB_QUEUE", "provenpick:submit_jobs")
+# Job worker tasks started with the API (0 runs no workers in this process)
+SUBMIT_JOB_WORKERS = int(os.getenv("SUBMIT_JOB_WORKERS", "1"))
+SUBMIT_JOB_BATCH_SIZE = int(os.getenv("SUBMIT_JOB_BATCH_SIZE", "50"))
+SUBMIT_JOB_BATCH_WAIT_MS = int(os.getenv("SUBMIT_JOB_BATCH_WAIT_MS", "200"))
+# Seconds a job's status is kept
+SUBMIT_JOB_TTL = int(os.getenv("SUBMIT_JOB_TTL", str(7 * 24 * 3600)))
+FETCH_TIMEOUT = 5
+# Longest wait between attempts to reach Redis when starting the workers
+SUBMIT_JOB_START_RETRY_MAX = 60
+
+
+def job_key(job_id: str) -> str:
+    """Redis hash holding a job's status"""
+    return f"{SUBMIT_JOB_QUEUE}:job:{job_id}"
+
+
+async def enqueue_job(submission: ArticleSubmission) -> str:
+    """
+    Record a submit job and queue its submission.
+
+    Args:
+        submission: Validated submission
+
+    Returns:
+        Job ID
+    """
+    client = get_redis()
+    job_id = str(uuid.uuid4())
+    now = datetime.now().isoformat()
+    message = SubmitJobMessage(job_id=job_id, submission=submission).model_dump_json()
+
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.hset(
+            job_key(job_id),
+            mapping={"status": "queued", "created_at": now, "updated_at": now},
+        )
+        pipe.expire(job_key(job_id), SUBMIT_JOB_TTL)
+        pipe.rpush(SUBMIT_JOB_QUEUE, message)
+        await pipe.execute()
+
+    return job_id
+
+
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a job's status.
+
+    Returns:
+        Job status dict, or None if the job does not exist (or expired)
+    """
+    job = await get_redis().hgetall(job_key(job_id))
+    if not job:
+        return None
+
+    result = {
+        "job_id": job_id,
+        "status": job["status"],
+        "attempts": int(job.get("attempts", 0)),
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at"),
+    }
+    if "staging_article_id" in job:
+        result["staging_article_id"] = int(job["staging_article_id"])
+        result["duplicate"] = job.get("duplicate") == "1"
+    if "error" in job:
+        result["error"] = job["error"]
+    return result
+
+
+async def update_jobs(updates: Dict[str, Dict[str, Any]]):
+    """
+    Update the status of several jobs in one round trip.
+
+    Args:
+        updates: job_id -> fields to set (None values remove the field)
+    """
+    if not updates:
+        return
+
+    now = datetime.now().isoformat()
+    async with get_redis().pipeline(transaction=False) as pipe:
+        for job_id, fields in updates.items():
+            key = job_key(job_id)
+            mapping = {"updated_at": now}
+            for name, value in fields.items():
+                if value is None:
+                    pipe.hdel(key, name)
+                else:
+                    mapping[name] = value
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, SUBMIT_JOB_TTL)
+        await pipe.execute()
+
+
+async def process_jobs(backend, retries: RetryScheduler, messages: List):
+    """
+    Write a batch of queued jobs to staging and record their results.
+
+    Args:
+        backend: Job queue backend
+        retries: RetryScheduler for the job queue
+        messages: Fetched job messages
+    """
+    jobs = []
+    invalid = []
+    for message in messages:
+        try:
+            job = SubmitJobMessage.model_validate_json(message.payload)
+            jobs.append((message, job.job_id, job.submission))
+        except ValidationError as e:
+            logger.error(f"Invalid job message: {e}")
+            invalid.append(message)
+
+    if invalid:
+        # A retry cannot fix a malformed message
+        await backend.fail_many(invalid)
+    if not jobs:
+        return
+
+    await update_jobs({job_id: {"status": "running"} for _, job_id, _ in jobs})
+
+    try:
+        results = await submit_batch([submission for _, _, submission in jobs])
+    except Exception as e:
+        logger.error(f"Job batch failed: {e}")
+        await retry_jobs(
+            retries, [(message, job_id, str(e)) for message, job_id, _ in jobs]
+        )
+        return
+
+    updates = {}
+    finished = []
+    transient = []
+    for (message, job_id, _), result in zip(jobs, results):
+        if result["success"]:
+            updates[job_id] = {
+                "status": "succeeded",
+                "staging_article_id": result["staging_article_id"],
+                "duplicate": "1" if result.get("duplicate") else "0",
+                "error": None,
+            }
+            finished.append(message)
+        elif result.get("retryable"):
+            # e.g. the database is down: retried with backoff
+            transient.append((message, job_id, result["error"]))
+        else:
+            # Validation and other per-article errors are final
+            updates[job_id] = {"status": "failed", "error": result["error"]}
+            finished.append(message)
+    await update_jobs(updates)
+    await retry_jobs(retries, transient)
+    await backend.ack_many(finished)
+
+    logger.info(f"Processed {len(jobs)} submit job(s)")
+
+
+async def retry_jobs(retries: RetryScheduler, jobs: List):
+    """
+    Requeue jobs whose write hit a transient error.
+
+    Args:
+        retries: RetryScheduler for the job queue
+        jobs: (message, job_id, error) tuples
+    """
+    if not jobs:
+        return
+
+    updates = {}
+    for message, job_id, error in jobs:
+        _, attempt = next_attempt(message.payload)
+        updates[job_id] = {
+            "status": "failed" if attempt > retries.max_attempts else "queued",
+            "attempts": attempt,
+            "error": error,
+        }
+    await update_jobs(updates)
+    await retries.schedule_many([message for message, _, _ in jobs])
+
+
+async def job_worker(
+    worker_id: int, backend, retries: RetryScheduler, stop: asyncio.Event
+):
+    """Fetch and process job batches until `stop` is set"""
+    while not stop.is_set():
+        try:
+            messages = await backend.fetch_batch(
+                worker_id,
+                SUBMIT_JOB_BATCH_SIZE,
+                SUBMIT_JOB_BATCH_WAIT_MS,
+                FETCH_TIMEOUT,
+            )
+            if messages:
+                await process_jobs(backend, retries, messages)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"[job worker {worker_id}] Error: {e}")
+            await asyncio.sleep(1)  # Wait before retrying
+
+
+class JobRunner:
+    """
+    Runs the job workers, reaper and retry scheduler in the API process.
+
+    Started in the background: while Redis is unreachable the runner keeps
+    retrying, and the rest of the API (sync submits, review UI) works.
+    """
+
+    def __init__(self, workers: int = SUBMIT_JOB_WORKERS):
+        self.workers = workers
+        self.stop = asyncio.Event()
+        self.tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        if self.workers <= 0:
+            return
+        self.tasks = [asyncio.create_task(self._run())]
+
+    async def _run(self):
+        """Set up the job queue (retrying until Redis answers), then start"""
+        backend = ReliableListQueueBackend(get_redis(), SUBMIT_JOB_QUEUE)
+        delay = 1
+        while not self.stop.is_set():
+            try:
+                await backend.setup()
+                break
+            except Exception as e:
+                logger.warning(f"Submit job queue unavailable ({e}), retry in {delay}s")
+                try:
+                    await asyncio.wait_for(self.stop.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                delay = min(delay * 2, SUBMIT_JOB_START_RETRY_MAX)
+        if self.stop.is_set():
+            return
+
+        retries = RetryScheduler(backend)
+        self.tasks.extend(
+            asyncio.create_task(job_worker(i, backend, retries, self.stop))
+            for i in range(self.workers)
+        )
+        self.tasks.append(asyncio.create_task(backend.run_maintenance(self.stop)))
+        self.tasks.append(asyncio.create_task(retries.run(self.stop)))
+        logger.info(
+            f"Started {self.workers} submit job worker(s) on {SUBMIT_JOB_QUEUE}"
+        )
+
+    async def close(self):
+        """Stop after the current batches complete"""
+        self.stop.set()
+        # _run may still be adding tasks until it returns
+        await asyncio.gather(*self.tasks[:1], return_exceptions=True)
+        await asyncio.gather(*self.tasks, return_exceptions=True)
@@ -0,0 +1,161 @@
+"""
+Postgres LISTEN/NOTIFY for the API process.
+
+One dedicated connection listens on every channel the API cares about and
+wakes waiting requests when a notification arrives, so long-polling clients
+do not each hold a connection or re-query in a loop. Notifications are only
+wake-ups: waiters re-read the tables for the actual data, so a missed or
+coalesced notification never loses anything.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, Iterable, List, Optional
+
+from backend.db.tables import RejectionQueueTable
+
+logger = logging.getLogger(__name__)
+
+REJECTIONS_CHANNEL = "staging_rejections"
+# Staging state change events (see services/events.py)
+EVENTS_CHANNEL = "staging_events"
+# Seconds between reconnect attempts after the listen connection drops
+RECONNECT_DELAY = 1
+
+
+async def notify(channel: str, payload: str = ""):
+    """
+    Send a notification on a channel.
+
+    Args:
+        channel: Channel name
+        payload: Optional payload (listeners here only use it for logging)
+    """
+    await RejectionQueueTable.raw("SELECT pg_notify({}, {})", channel, payload).run()
+
+
+class NotificationListener:
+    """Shared LISTEN connection waking waiters per channel"""
+
+    def __init__(self, channels: Iterable[str]):
+        self.channels = list(channels)
+        self._events: Dict[str, asyncio.Event] = {
+            channel: asyncio.Event() for channel in self.channels
+        }
+        self._handlers: Dict[str, List[Callable[[str], None]]] = {
+            channel: [] for channel in self.channels
+        }
+        self._connection = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = asyncio.Event()
+
+    @property
+    def connected(self) -> bool:
+        """Whether notifications are currently being received"""
+        return self._connection is not None and not self._connection.is_closed()
+
+    def event(self, channel: str) -> asyncio.Event:
+        """
+        Event set by the next notification on `channel`.
+
+        Take the event *before* checking the table, then wait on it; a
+        notification arriving in between still wakes the waiter.
+        """
+        return self._events[channel]
+
+    def _wake(self, channel: str):
+        # Waiters hold the old event; later callers get a fresh one
+        self._events[channel].set()
+        self._events[channel] = asyncio.Event()
+
+    def add_handler(self, channel: str, handler: Callable[[str], None]):
+        """Call `handler(payload)` for every notification on `channel`"""
+        self._handlers[channel].append(handler)
+
+    def _on_notification(self, connection, pid, channel, payload):
+        logger.debug(f"Notification on {channel}: {payload}")
+        for handler in self._handlers[channel]:
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.error(f"Notification handler failed on {channel}: {e}")
+        self._wake(channel)
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        """Keep a listening connection open until closed"""
+        engine = RejectionQueueTable._meta.db
+
+        while not self._closed.is_set():
+            dropped = asyncio.Event()
+            try:
+                self._connection = await engine.get_new_connection()
+                self._connection.add_termination_listener(lambda _: dropped.set())
+                for channel in self.channels:
+                    await self._connection.add_listener(channel, self._on_notification)
+                logger.info(f"Listening for notifications on {self.channels}")
+
+                # Anything sent while disconnected was missed: re-check now
+                for channel in self.channels:
+                    self._wake(channel)
+
+                waits = [
+                    asyncio.create_task(dropped.wait()),
+                    asyncio.create_task(self._closed.wait()),
+                ]
+                try:
+                    await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    for task in waits:
+                        task.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Notification listener error: {e}")
+
+            await self._close_connection()
+            if not self._closed.is_set():
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _close_connection(self):
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            try:
+                await connection.close()
+            except Exception as e:
+                logger.warning(f"Failed to close notification connection: {e}")
+
+    async def close(self):
+        """Stop listening and wake every waiter"""
+        self._closed.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        await self._close_connection()
+        for channel in self.channels:
+            self._wake(channel)
+
+
+listener = NotificationListener([REJECTIONS_CHANNEL, EVENTS_CHANNEL])
+
+
+async def wait_for_notification(
+    event: asyncio.Event, timeout: float, poll_interval: float
+):
+    """
+    Wait until `event` (from listener.event()) is set or `timeout` passes.
+
+    While the listener is not connected this returns after at most
+    `poll_interval`, so callers fall back to re-checking the table
+    periodically.
+    """
+    if not listener.connected:
+        await asyncio.sleep(min(timeout, poll_interval))
+        return
+
+    try:
+        await asyncio.wait_for(event.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
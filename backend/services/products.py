@@ -0,0 +1,96 @@
+"""
+Product fingerprints.
+
+The same product shows up in many staging articles, each copy stored as its
+own staging_product row (with that article's pick labels in its specs, and
+deleted together with the article on approval or rejection). Every row
+carries an indexed fingerprint identifying the underlying product, so all
+copies of a product are linked and "where else is this product used" is an
+index lookup instead of a scan over names and affiliate JSON.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from backend.db.tables import StagingProductTable
+
+# Amazon product URLs: .../dp/<ASIN>, .../gp/product/<ASIN>
+ASIN_PATTERN = re.compile(r"/(?:dp|gp/product)/([A-Z0-9]{10})(?:[/?#]|$)")
+
+
+def find_asin(affiliate_links: Any) -> Optional[str]:
+    """Amazon ASIN from a product's affiliate links, if there is one"""
+    if isinstance(affiliate_links, str):
+        # JSONB as returned by raw queries
+        try:
+            affiliate_links = json.loads(affiliate_links)
+        except ValueError:
+            return None
+    if not isinstance(affiliate_links, dict):
+        return None
+
+    asin = affiliate_links.get("asin")
+    if isinstance(asin, str) and asin.strip():
+        return asin.strip().upper()
+
+    for url in affiliate_links.values():
+        if isinstance(url, str):
+            match = ASIN_PATTERN.search(url)
+            if match:
+                return match.group(1)
+    return None
+
+
+def normalize_name(value: Optional[str]) -> str:
+    """Casefold and drop punctuation and extra whitespace"""
+    words = re.sub(r"[^\w]+", " ", (value or "").casefold()).split()
+    return " ".join(words)
+
+
+def product_fingerprint(product: Dict[str, Any]) -> str:
+    """
+    Fingerprint identifying a product across staging articles.
+
+    The affiliate ASIN is used when there is one, otherwise the normalized
+    brand and name, so "Sony WH-1000XM5" and "sony wh 1000xm5" match.
+
+    Args:
+        product: StagingProductTable values (name, brand, affiliate_links)
+
+    Returns:
+        64-character hex digest
+    """
+    asin = find_asin(product.get("affiliate_links"))
+    if asin:
+        key = f"asin:{asin}"
+    else:
+        brand = normalize_name(product.get("brand"))
+        key = f"name:{brand}|{normalize_name(product.get('name'))}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+async def find_product_usages(fingerprint: str) -> List[Dict[str, Any]]:
+    """
+    Find every staging article using a product.
+
+    Args:
+        fingerprint: Product fingerprint
+
+    Returns:
+        One row per staging product copy, oldest first, with its article's
+        ID, title and status
+    """
+    return await StagingProductTable.raw(
+        """
+        SELECT p.staging_product_id, p.staging_article_id, p.name, p.brand,
+               p.price, a.title, a.status
+        FROM staging.staging_product AS p
+        LEFT JOIN staging.staging_article AS a
+            ON a.staging_article_id = p.staging_article_id
+        WHERE p.fingerprint = {}
+        ORDER BY p.staging_product_id
+        """,
+        fingerprint,
+    ).run()
@@ -0,0 +1,586 @@
+"""
+Queue backends for the submit queue consumer.
+
+Each backend hands out messages to consumer workers and is told when a
+message has been committed (ack) or failed. The plain list backend pops
+messages outright, the reliable backend keeps them in a per-worker
+processing list until they are acknowledged, and the stream backend uses a
+Redis Streams consumer group so several consumer replicas can share the work.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+# Submit queue the workflow pushes to, and the backend the consumer reads
+# it with: "list" pops messages with BLPOP, "reliable" keeps them in a
+# processing list until they are committed, "stream" reads SUBMIT_STREAM
+# through a Redis Streams consumer group.
+SUBMIT_QUEUE = os.getenv("SUBMIT_QUEUE", "provenpick:submit_to_staging")
+QUEUE_BACKEND = os.getenv("QUEUE_BACKEND", "list")
+
+# Identifies this consumer process in processing list names. Set a stable
+# value per process to have its in-flight messages re-queued immediately on
+# restart instead of after the visibility timeout.
+CONSUMER_ID = os.getenv("CONSUMER_ID", f"{socket.gethostname()}-{os.getpid()}")
+
+# Seconds a message may stay in a processing list before the reaper
+# returns it to the submit queue
+VISIBILITY_TIMEOUT = int(os.getenv("VISIBILITY_TIMEOUT", "300"))
+REAPER_INTERVAL = int(os.getenv("REAPER_INTERVAL", "15"))
+
+# How often fetch_batch re-checks an empty queue while filling a batch
+BATCH_POLL_INTERVAL = 0.02
+
+# Streams backend: producers XADD the JSON message under STREAM_FIELD
+SUBMIT_STREAM_GROUP = os.getenv("SUBMIT_STREAM_GROUP", "staging-consumers")
+STREAM_FIELD = "data"
+
+# Moves everything in an expired processing list back to the head of the
+# queue, but only if its deadline is still expired when the script runs.
+# KEYS: processing list, visibility zset, queue. ARGV: now
+REQUEUE_EXPIRED_SCRIPT = """
+local deadline = redis.call('ZSCORE', KEYS[2], KEYS[1])
+if not deadline or tonumber(deadline) > tonumber(ARGV[1]) then
+    return -1
+end
+local moved = 0
+while redis.call('LMOVE', KEYS[1], KEYS[3], 'RIGHT', 'LEFT') do
+    moved = moved + 1
+end
+redis.call('ZREM', KEYS[2], KEYS[1])
+return moved
+"""
+
+# Removes finished messages from a processing list, copying them to the
+# failed queue if ARGV[2] is "1". Other messages may still be in flight in
+# the same list (fetchers keep adding batches), so the list's deadline is
+# only dropped once it is empty; otherwise it is pushed back to ARGV[1].
+# KEYS: processing list, visibility zset, failed queue.
+# ARGV: new deadline, fail flag, payloads...
+ACK_SCRIPT = """
+for i = 3, #ARGV do
+    if ARGV[2] == '1' then
+        redis.call('RPUSH', KEYS[3], ARGV[i])
+    end
+    redis.call('LREM', KEYS[1], 1, ARGV[i])
+end
+if redis.call('LLEN', KEYS[1]) == 0 then
+    redis.call('ZREM', KEYS[2], KEYS[1])
+else
+    redis.call('ZADD', KEYS[2], ARGV[1], KEYS[1])
+end
+return #ARGV - 2
+"""
+
+# Moves up to ARGV[1] messages from the queue into a processing list.
+# KEYS: queue, processing list
+MOVE_MANY_SCRIPT = """
+local moved = {}
+for i = 1, tonumber(ARGV[1]) do
+    local payload = redis.call('LMOVE', KEYS[1], KEYS[2], 'LEFT', 'RIGHT')
+    if not payload then
+        break
+    end
+    moved[#moved + 1] = payload
+end
+return moved
+"""
+
+
+def submit_stream_key(queue: str) -> str:
+    """Stream the stream backend uses for `queue` (SUBMIT_STREAM overrides)"""
+    return os.getenv("SUBMIT_STREAM", f"{queue}:stream")
+
+
+@dataclass
+class QueueMessage:
+    """A message fetched from a queue backend"""
+
+    payload: str
+    worker_id: int
+    receipt: Any = None  # Backend-specific handle needed to ack the message
+
+
+class ListQueueBackend:
+    """
+    Plain Redis list backend.
+
+    Messages are removed from the queue by BLPOP, so a message being
+    processed when the consumer dies is lost (at-most-once delivery).
+    """
+
+    name = "list"
+
+    def __init__(self, client: "aioredis.Redis", queue: str):
+        self.client = client
+        self.queue = queue
+        self.failed_queue = f"{queue}:failed"
+
+    @property
+    def enqueue_target(self):
+        """(key, "list" or "stream") that producers push new messages to"""
+        return self.queue, "list"
+
+    async def setup(self):
+        """Prepare the backend before workers start"""
+
+    async def fetch(self, worker_id: int, timeout: int) -> Optional[QueueMessage]:
+        """
+        Wait up to `timeout` seconds for the next message.
+
+        Args:
+            worker_id: Index of the worker asking for a message
+            timeout: Seconds to block
+
+        Returns:
+            The message, or None on timeout
+        """
+        result = await self.client.blpop(self.queue, timeout=timeout)
+        if not result:
+            return None
+        return QueueMessage(payload=result[1], worker_id=worker_id)
+
+    async def fetch_batch(
+        self, worker_id: int, max_count: int, max_wait_ms: int, timeout: int
+    ) -> List[QueueMessage]:
+        """
+        Fetch up to `max_count` messages.
+
+        Blocks up to `timeout` seconds for the first message, then keeps
+        collecting for at most `max_wait_ms` milliseconds or until the batch
+        is full.
+
+        Args:
+            worker_id: Index of the worker asking for messages
+            max_count: Maximum batch size
+            max_wait_ms: Time to wait for the batch to fill after the first message
+            timeout: Seconds to block for the first message
+
+        Returns:
+            Fetched messages (empty on timeout)
+        """
+        first = await self.fetch(worker_id, timeout)
+        if first is None:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + max_wait_ms / 1000
+        while len(batch) < max_count:
+            more = await self._pop_many(worker_id, max_count - len(batch))
+            batch.extend(more)
+            remaining = deadline - time.monotonic()
+            if len(batch) >= max_count or remaining <= 0:
+                break
+            if not more:
+                await asyncio.sleep(min(remaining, BATCH_POLL_INTERVAL))
+        return batch
+
+    async def _pop_many(self, worker_id: int, count: int) -> List[QueueMessage]:
+        """Pop up to `count` messages without blocking"""
+        payloads = await self.client.lpop(self.queue, count) or []
+        return [QueueMessage(payload=p, worker_id=worker_id) for p in payloads]
+
+    async def ack(self, message: QueueMessage):
+        """Acknowledge a message once it has been committed"""
+
+    async def fail(self, message: QueueMessage):
+        """Move a message that could not be processed to the failed queue"""
+        await self.client.rpush(self.failed_queue, message.payload)
+
+    async def ack_many(self, messages: List[QueueMessage]):
+        """Acknowledge several messages"""
+        for message in messages:
+            await self.ack(message)
+
+    async def fail_many(self, messages: List[QueueMessage]):
+        """Move several messages to the failed queue"""
+        if messages:
+            await self.client.rpush(self.failed_queue, *[m.payload for m in messages])
+
+    async def run_maintenance(self, stop):
+        """Background housekeeping, runs until `stop` is set"""
+
+    async def stats(self) -> Dict[str, Any]:
+        """Queue depth and in-flight counts for monitoring"""
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.llen(self.queue)
+            pipe.llen(self.failed_queue)
+            queued, failed = await pipe.execute()
+        return {"backend": self.name, "queued": queued, "failed": failed}
+
+
+class ReliableListQueueBackend(ListQueueBackend):
+    """
+    Redis list backend with at-least-once delivery.
+
+    BLMOVE atomically moves each message into a per-worker processing list
+    and records a visibility deadline for that list in a sorted set. The
+    message is removed only on ack (or when moved to the failed queue). A
+    reaper re-queues messages whose deadline expired, so a consumer killed
+    mid-insert loses nothing.
+    """
+
+    name = "reliable"
+
+    def __init__(
+        self,
+        client: "aioredis.Redis",
+        queue: str,
+        consumer_id: str = CONSUMER_ID,
+        visibility_timeout: int = VISIBILITY_TIMEOUT,
+    ):
+        super().__init__(client, queue)
+        self.consumer_id = consumer_id
+        self.visibility_timeout = visibility_timeout
+        self.visibility_key = f"{queue}:visibility"
+        self._requeue_expired = client.register_script(REQUEUE_EXPIRED_SCRIPT)
+        self._move_many = client.register_script(MOVE_MANY_SCRIPT)
+        self._ack = client.register_script(ACK_SCRIPT)
+
+    def processing_key(self, worker_id: int) -> str:
+        """Processing list owned by one worker of this consumer"""
+        return f"{self.queue}:processing:{self.consumer_id}:{worker_id}"
+
+    async def setup(self):
+        """Re-queue messages left in this consumer's processing lists"""
+        pattern = f"{self.queue}:processing:{self.consumer_id}:*"
+        async for key in self.client.scan_iter(match=pattern):
+            # Nothing of ours is in flight yet, so any leftover is orphaned
+            await self.client.zadd(self.visibility_key, {key: 0})
+            moved = await self._requeue_expired(
+                keys=[key, self.visibility_key, self.queue], args=[time.time()]
+            )
+            if moved > 0:
+                logger.warning(f"Recovered {moved} in-flight message(s) from {key}")
+
+    async def fetch(self, worker_id: int, timeout: int) -> Optional[QueueMessage]:
+        key = self.processing_key(worker_id)
+
+        # Register the deadline before blocking so there is no window in
+        # which a claimed message has no deadline
+        await self.client.zadd(
+            self.visibility_key,
+            {key: time.time() + timeout + self.visibility_timeout},
+        )
+
+        payload = await self.client.blmove(
+            self.queue, key, timeout, src="LEFT", dest="RIGHT"
+        )
+        if payload is None:
+            return None
+
+        await self.client.zadd(
+            self.visibility_key, {key: time.time() + self.visibility_timeout}
+        )
+        return QueueMessage(payload=payload, worker_id=worker_id, receipt=key)
+
+    async def ack(self, message: QueueMessage):
+        await self.ack_many([message])
+
+    async def fail(self, message: QueueMessage):
+        await self.fail_many([message])
+
+    async def _pop_many(self, worker_id: int, count: int) -> List[QueueMessage]:
+        # The first message of the batch already registered the deadline
+        key = self.processing_key(worker_id)
+        payloads = await self._move_many(keys=[self.queue, key], args=[count])
+        return [
+            QueueMessage(payload=p, worker_id=worker_id, receipt=key) for p in payloads
+        ]
+
+    async def ack_many(self, messages: List[QueueMessage]):
+        await self._finish(messages, failed=False)
+
+    async def fail_many(self, messages: List[QueueMessage]):
+        await self._finish(messages, failed=True)
+
+    async def _finish(self, messages: List[QueueMessage], failed: bool):
+        """Remove messages from their processing lists (see ACK_SCRIPT)"""
+        by_key: Dict[str, List[str]] = {}
+        for message in messages:
+            by_key.setdefault(message.receipt, []).append(message.payload)
+
+        deadline = time.time() + self.visibility_timeout
+        for key, payloads in by_key.items():
+            await self._ack(
+                keys=[key, self.visibility_key, self.failed_queue],
+                args=[deadline, "1" if failed else "0", *payloads],
+            )
+
+    async def reap_expired(self) -> int:
+        """
+        Re-queue messages whose visibility timeout has expired.
+
+        Returns:
+            Number of messages returned to the submit queue
+        """
+        now = time.time()
+        expired = await self.client.zrangebyscore(self.visibility_key, "-inf", now)
+
+        requeued = 0
+        for key in expired:
+            moved = await self._requeue_expired(
+                keys=[key, self.visibility_key, self.queue], args=[now]
+            )
+            if moved > 0:
+                logger.warning(
+                    f"Visibility timeout expired, re-queued {moved} message(s) from {key}"
+                )
+                requeued += moved
+        return requeued
+
+    async def run_maintenance(self, stop):
+        """Run the reaper every REAPER_INTERVAL seconds"""
+        while not stop.is_set():
+            try:
+                await self.reap_expired()
+            except Exception as e:
+                logger.error(f"Reaper error: {e}")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=REAPER_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stats(self) -> Dict[str, Any]:
+        """Queue depth plus in-flight message counts per consumer"""
+        result = await super().stats()
+
+        in_flight: Dict[str, int] = {}
+        prefix = f"{self.queue}:processing:"
+        async for key in self.client.scan_iter(match=f"{prefix}*"):
+            consumer_id = key[len(prefix) :].rsplit(":", 1)[0]
+            in_flight[consumer_id] = in_flight.get(consumer_id, 0) + (
+                await self.client.llen(key)
+            )
+
+        result["pending"] = sum(in_flight.values())
+        result["consumers"] = in_flight
+        return result
+
+
+class StreamQueueBackend(ListQueueBackend):
+    """
+    Redis Streams consumer-group backend.
+
+    Producers XADD messages to the submit stream. Every consumer replica
+    reads through the same consumer group with XREADGROUP, so each message
+    is delivered to exactly one replica and stays in that replica's pending
+    entries list until XACK. Messages pending longer than the visibility
+    timeout (e.g. their consumer died) are taken over with XAUTOCLAIM.
+    Failed messages still go to the `{queue}:failed` list.
+    """
+
+    name = "stream"
+
+    def __init__(
+        self,
+        client: "aioredis.Redis",
+        queue: str,
+        stream: Optional[str] = None,
+        group: str = SUBMIT_STREAM_GROUP,
+        consumer_id: str = CONSUMER_ID,
+        visibility_timeout: int = VISIBILITY_TIMEOUT,
+    ):
+        super().__init__(client, queue)
+        self.stream = stream or submit_stream_key(queue)
+        self.group = group
+        self.consumer_id = consumer_id
+        self.visibility_timeout = visibility_timeout
+        # Messages claimed from dead consumers, handed out before new ones
+        self._reclaimed = deque()
+
+    @property
+    def enqueue_target(self):
+        return self.stream, "stream"
+
+    async def setup(self):
+        """Create the consumer group (and stream) if needed"""
+        try:
+            await self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+            logger.info(f"Created consumer group {self.group} on {self.stream}")
+        except aioredis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def fetch(self, worker_id: int, timeout: int) -> Optional[QueueMessage]:
+        if self._reclaimed:
+            entry_id, payload = self._reclaimed.popleft()
+            return QueueMessage(payload=payload, worker_id=worker_id, receipt=entry_id)
+
+        result = await self.client.xreadgroup(
+            self.group,
+            self.consumer_id,
+            {self.stream: ">"},
+            count=1,
+            block=timeout * 1000,
+        )
+        if not result:
+            return None
+
+        _, entries = result[0]
+        entry_id, fields = entries[0]
+        return QueueMessage(
+            payload=fields.get(STREAM_FIELD, ""), worker_id=worker_id, receipt=entry_id
+        )
+
+    async def fetch_batch(
+        self, worker_id: int, max_count: int, max_wait_ms: int, timeout: int
+    ) -> List[QueueMessage]:
+        batch = []
+        while self._reclaimed and len(batch) < max_count:
+            entry_id, payload = self._reclaimed.popleft()
+            batch.append(
+                QueueMessage(payload=payload, worker_id=worker_id, receipt=entry_id)
+            )
+        if batch:
+            return batch
+
+        # A stream batch read: block for the first entry, take up to max_count
+        result = await self.client.xreadgroup(
+            self.group,
+            self.consumer_id,
+            {self.stream: ">"},
+            count=max_count,
+            block=timeout * 1000,
+        )
+        if not result:
+            return []
+
+        _, entries = result[0]
+        return [
+            QueueMessage(
+                payload=fields.get(STREAM_FIELD, ""),
+                worker_id=worker_id,
+                receipt=entry_id,
+            )
+            for entry_id, fields in entries
+        ]
+
+    async def ack(self, message: QueueMessage):
+        await self.ack_many([message])
+
+    async def fail(self, message: QueueMessage):
+        await self.fail_many([message])
+
+    async def ack_many(self, messages: List[QueueMessage]):
+        if not messages:
+            return
+        entry_ids = [m.receipt for m in messages]
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, self.group, *entry_ids)
+            pipe.xdel(self.stream, *entry_ids)
+            await pipe.execute()
+
+    async def fail_many(self, messages: List[QueueMessage]):
+        if not messages:
+            return
+        entry_ids = [m.receipt for m in messages]
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.rpush(self.failed_queue, *[m.payload for m in messages])
+            pipe.xack(self.stream, self.group, *entry_ids)
+            pipe.xdel(self.stream, *entry_ids)
+            await pipe.execute()
+
+    async def claim_stale(self) -> int:
+        """
+        Take over messages idle in any consumer's pending list for longer
+        than the visibility timeout.
+
+        Returns:
+            Number of messages claimed by this consumer
+        """
+        claimed = 0
+        start_id = "0-0"
+        while True:
+            response = await self.client.xautoclaim(
+                self.stream,
+                self.group,
+                self.consumer_id,
+                min_idle_time=self.visibility_timeout * 1000,
+                start_id=start_id,
+                count=100,
+            )
+            start_id, entries = response[0], response[1]
+
+            for entry_id, fields in entries:
+                if fields is None:
+                    # Entry was deleted from the stream, just drop it
+                    await self.client.xack(self.stream, self.group, entry_id)
+                    continue
+                self._reclaimed.append((entry_id, fields.get(STREAM_FIELD, "")))
+                claimed += 1
+
+            if start_id in ("0-0", b"0-0"):
+                break
+
+        if claimed:
+            logger.warning(f"Claimed {claimed} stale message(s) from {self.stream}")
+        return claimed
+
+    async def run_maintenance(self, stop):
+        """Claim stale messages and log pending counts every REAPER_INTERVAL"""
+        while not stop.is_set():
+            try:
+                await self.claim_stale()
+                stats = await self.stats()
+                if stats["pending"]:
+                    logger.info(
+                        f"Stream {self.stream} pending={stats['pending']} "
+                        f"per consumer={stats['consumers']}"
+                    )
+            except Exception as e:
+                logger.error(f"Stream maintenance error: {e}")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=REAPER_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stats(self) -> Dict[str, Any]:
+        """Stream length, failed count and pending entries per consumer"""
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.xlen(self.stream)
+            pipe.llen(self.failed_queue)
+            pipe.xpending(self.stream, self.group)
+            queued, failed, pending = await pipe.execute()
+
+        return {
+            "backend": self.name,
+            "queued": queued,
+            "failed": failed,
+            "pending": pending["pending"],
+            "consumers": {
+                consumer["name"]: consumer["pending"]
+                for consumer in pending["consumers"]
+            },
+        }
+
+
+def get_queue_backend(name: str, client: "aioredis.Redis", queue: str):
+    """
+    Build the queue backend selected by name.
+
+    Args:
+        name: "list", "reliable" or "stream"
+        client: asyncio Redis client
+        queue: Submit queue name
+
+    Returns:
+        Queue backend instance
+    """
+    if name == "reliable":
+        return ReliableListQueueBackend(client, queue)
+    if name == "stream":
+        return StreamQueueBackend(client, queue)
+    if name == "list":
+        return ListQueueBackend(client, queue)
+    raise ValueError(f"Unknown queue backend: {name}")
@@ -10,23 +10,56 @@ import json
 import logging
 import os
 import sys
-from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import List, Optional
 
 import redis
+import redis.asyncio as aioredis
 
 # Add parent to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from backend.services.queue_backends import QUEUE_BACKEND, SUBMIT_QUEUE
+
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
-# Redis configuration
+# Redis configuration (SUBMIT_QUEUE and QUEUE_BACKEND: see queue_backends)
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
-SUBMIT_QUEUE = os.getenv("SUBMIT_QUEUE", "provenpick:submit_to_staging")
+
+# Consumer mode: "sync" runs the original one-message-at-a-time loop, "pool"
+# runs CONSUMER_WORKERS concurrent workers on redis.asyncio with at most
+# CONSUMER_MAX_IN_FLIGHT messages being processed at once, "batch" runs the
+# same workers but each one drains up to BATCH_SIZE messages (waiting at most
+# BATCH_MAX_WAIT_MS) and writes them in one transaction, "pipeline" runs
+# PIPELINE_FETCHERS fetchers, a decoder and CONSUMER_MAX_IN_FLIGHT writers as
+# separate stages (see staged_consumer.py).
+CONSUMER_MODE = os.getenv("CONSUMER_MODE", "sync")
+CONSUMER_WORKERS = int(os.getenv("CONSUMER_WORKERS", "8"))
+CONSUMER_MAX_IN_FLIGHT = int(os.getenv("CONSUMER_MAX_IN_FLIGHT", "8"))
+PIPELINE_FETCHERS = int(os.getenv("PIPELINE_FETCHERS", "2"))
+# Postgres connections kept open even when idle (capped at max in-flight)
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "50"))
+BATCH_MAX_WAIT_MS = int(os.getenv("BATCH_MAX_WAIT_MS", "200"))
+BLPOP_TIMEOUT = 5
+
+# Port for the consumer's Prometheus metrics endpoint (0 disables it)
+CONSUMER_METRICS_PORT = int(os.getenv("CONSUMER_METRICS_PORT", "9100"))
+QUEUE_DEPTH_INTERVAL = 15
+
+# Redis users besides the workers: reaper, retry scheduler, queue depths
+BACKGROUND_REDIS_TASKS = 3
+
+# Outcomes of processing a message: written (or already in staging), failed
+# in a way a retry may fix, or not a valid submission at all (moved straight
+# to the failed queue, since retrying cannot fix it)
+PROCESSED = "processed"
+RETRY = "retry"
+INVALID = "invalid"
 
 
 def get_redis_client():
@@ -34,271 +67,155 @@ def get_redis_client():
     return redis.Redis(host=REDIS_HOST, port=REDIS_PORT, decode_responses=True)
 
 
-async def insert_article_to_staging(article_data: Dict[str, Any]) -> Optional[int]:
+def get_async_redis_client(max_connections: Optional[int] = None):
+    """
+    Get asyncio Redis client.
+
+    With `max_connections`, callers beyond the limit wait up to
+    REDIS_POOL_TIMEOUT seconds for a free connection instead of failing.
+    """
+    from backend.services.redis_pool import REDIS_POOL_TIMEOUT
+
+    if max_connections is None:
+        return aioredis.Redis(host=REDIS_HOST, port=REDIS_PORT, decode_responses=True)
+
+    pool = aioredis.BlockingConnectionPool(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        decode_responses=True,
+        max_connections=max_connections,
+        timeout=REDIS_POOL_TIMEOUT,
+    )
+    return aioredis.Redis.from_pool(pool)
+
+
+async def process_message(message: str) -> str:
     """
-    Insert article into staging database.
+    Process a single message from the queue.
 
     Args:
-        article_data: Article data from workflow
+        message: JSON message from Redis
 
     Returns:
-        Staging article ID if successful
+        PROCESSED, RETRY or INVALID
     """
-    from backend.db.tables import (
-        StagingArticleTable,
-        StagingProductTable,
-        StagingArticleTextTable,
-        StagingArticleImageTable,
-    )
+    from backend.metrics import INGEST_MESSAGES
+    from backend.services.dedupe import find_existing_articles, recent_uuids
+
+    article = decode_submission(message)
+    if article is None:
+        return INVALID
 
     try:
-        article_uuid = article_data.get("article_uuid")
-        l3_category_id = article_data.get("l3_category_id")
-        products = article_data.get("products", [])
-        content = article_data.get("content", {})
-        sources = article_data.get("sources", [])
-
-        # Use the catchy title from workflow, fallback to placeholder
-        title = article_data.get("title") or f"Review: Category {l3_category_id}"
-
-        logger.info(f"Inserting article {article_uuid} with {len(products)} products")
-        logger.info(f"Article title: {title}")
-
-        # Create the staging article
-        article = StagingArticleTable(
-            workflow_uuid=article_uuid,
-            title=title,  # Use catchy title from workflow
-            category=str(l3_category_id),
-            status="pending",
-            submitted_at=datetime.now(),
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
-            top_pick_staging_id=0,  # Will be updated after products are created
-        )
-
-        await article.save()
-        article_id = article._meta.primary_key
-
-        # Get the actual ID
-        saved_article = (
-            await StagingArticleTable.select(StagingArticleTable.staging_article_id)
-            .where(StagingArticleTable.workflow_uuid == article_uuid)
-            .first()
-        )
-
-        if saved_article:
-            article_id = saved_article["staging_article_id"]
-
-        logger.info(f"Created staging article with ID: {article_id}")
-
-        # Insert article text content
-        if content:
-            # Main article HTML
-            article_text = StagingArticleTextTable(
-                staging_article_id=article_id,
-                content=content.get("full_article_html", ""),
-                section_type="full_article",
-                sequence_order=0,
-                created_at=datetime.now(),
-            )
-            await article_text.save()
-
-            # Bullet points as separate section
-            bullets = content.get("bullet_points", [])
-            if bullets:
-                bullets_text = StagingArticleTextTable(
-                    staging_article_id=article_id,
-                    content=json.dumps(bullets),
-                    section_type="bullet_points",
-                    sequence_order=1,
-                    created_at=datetime.now(),
-                )
-                await bullets_text.save()
-
-            # Mindmap
-            mindmap = content.get("mindmap_mermaid", "")
-            if mindmap:
-                mindmap_text = StagingArticleTextTable(
-                    staging_article_id=article_id,
-                    content=mindmap,
-                    section_type="mindmap_summary",
-                    sequence_order=2,
-                    created_at=datetime.now(),
-                )
-                await mindmap_text.save()
-
-            # Introduction section (displayed above mindmap)
-            introduction = content.get("introduction", "")
-            if introduction:
-                intro_text = StagingArticleTextTable(
-                    staging_article_id=article_id,
-                    content=introduction,
-                    section_type="introduction",
-                    sequence_order=3,
-                    created_at=datetime.now(),
-                )
-                await intro_text.save()
-                logger.info(f"Stored introduction for article {article_id}")
-
-            logger.info(f"Created article text sections for article {article_id}")
-
-            # Store mindmap image if provided
-            mindmap_image_b64 = content.get("mindmap_image")
-            if mindmap_image_b64:
-                # Store as data URL for now (can be uploaded to S3 later)
-                image_url = f"data:image/png;base64,{mindmap_image_b64}"
-                mindmap_image = StagingArticleImageTable(
-                    staging_article_id=article_id,
-                    image_url=image_url,
-                    alt_text="Buying Guide Mindmap",
-                    image_type="mindmap",
-                    sequence_order=0,
-                    created_at=datetime.now(),
+        # Likely re-deliveries only cost a lookup, not a write transaction
+        workflow_uuid = article.workflow_uuid
+        if workflow_uuid and recent_uuids.get(workflow_uuid) is not None:
+            existing = await find_existing_articles([workflow_uuid])
+            if workflow_uuid in existing:
+                logger.info(
+                    f"Duplicate submission {workflow_uuid} "
+                    f"-> Staging ID: {existing[workflow_uuid]}, skipping"
                 )
-                await mindmap_image.save()
-                logger.info(f"Stored mindmap image for article {article_id}")
-
-        # Insert products and track pick IDs
-        top_pick_id = None
-        runner_up_id = None
-        budget_pick_id = None
-        first_product_id = None
-
-        for i, product in enumerate(products):
-            # Build description from available info
-            description = (
-                product.get("best_for")
-                or product.get("pick_label")
-                or product.get("target_persona")
-                or "General purpose"
-            )
+                INGEST_MESSAGES.labels("consumer", "duplicate").inc()
+                return PROCESSED
 
-            # Store pick_type and pick_label in specs
-            specs = product.get("specs", {})
-            if not isinstance(specs, dict):
-                specs = {}
-            specs["pick_type"] = product.get("pick_type", "")
-            specs["pick_label"] = product.get("pick_label", "")
-            specs["target_persona"] = product.get("target_persona", "")
-            specs["best_for"] = product.get("best_for", "")
-
-            staging_product = StagingProductTable(
-                staging_article_id=article_id,
-                name=product.get("name", "Unknown Product"),
-                brand=product.get("brand") or "",
-                category=str(l3_category_id),
-                price=product.get("price_inr") or 0,  # Default to 0 if None
-                description=description,  # Never None
-                image_url=product.get("image_urls", [""])[0]
-                if product.get("image_urls")
-                else "",
-                specs=specs,
-                affiliate_links=product.get("affiliate_links", {}),
-                created_at=datetime.now(),
-            )
-            await staging_product.save()
-
-            # Get product ID
-            saved_product = (
-                await StagingProductTable.select(StagingProductTable.staging_product_id)
-                .where(StagingProductTable.name == product.get("name"))
-                .where(StagingProductTable.staging_article_id == article_id)
-                .first()
-            )
+        written = (await write_submissions([article]))[0]
+        return PROCESSED if written else RETRY
+    except Exception as e:
+        logger.error(f"Error processing message: {e}")
+        return RETRY
 
-            if saved_product:
-                product_id = saved_product["staging_product_id"]
-                pick_type = product.get("pick_type", "")
-
-                # Track first product as fallback top_pick
-                if i == 0:
-                    first_product_id = product_id
-
-                # Assign pick IDs based on pick_type
-                if pick_type == "top_pick" and top_pick_id is None:
-                    top_pick_id = product_id
-                    logger.info(f"Top pick: {product.get('name')} (ID: {product_id})")
-                elif pick_type == "value_pick" and runner_up_id is None:
-                    runner_up_id = product_id
-                    logger.info(
-                        f"Runner up (value_pick): {product.get('name')} (ID: {product_id})"
-                    )
-                elif pick_type == "budget_pick" and budget_pick_id is None:
-                    budget_pick_id = product_id
-                    logger.info(
-                        f"Budget pick: {product.get('name')} (ID: {product_id})"
-                    )
-
-            logger.info(
-                f"Created product: {product.get('name')} (pick_type: {product.get('pick_type', 'none')})"
-            )
 
-        # Use first product as fallback for top_pick if none assigned
-        if top_pick_id is None and first_product_id is not None:
-            top_pick_id = first_product_id
-            logger.info(f"Using first product as top_pick fallback: {top_pick_id}")
-
-        # Update article with all pick IDs
-        update_data = {}
-        if top_pick_id:
-            update_data[StagingArticleTable.top_pick_staging_id] = top_pick_id
-        if runner_up_id:
-            update_data[StagingArticleTable.runner_up_staging_id] = runner_up_id
-        if budget_pick_id:
-            update_data[StagingArticleTable.budget_pick_staging_id] = budget_pick_id
-
-        if update_data:
-            await StagingArticleTable.update(update_data).where(
-                StagingArticleTable.staging_article_id == article_id
-            )
-            logger.info(
-                f"Updated article {article_id} with picks: top={top_pick_id}, runner_up={runner_up_id}, budget={budget_pick_id}"
-            )
+def decode_submission(message: str):
+    """
+    Decode and validate one submit message.
 
-        return article_id
+    Args:
+        message: JSON message from Redis
 
-    except Exception as e:
-        logger.error(f"Failed to insert article: {e}")
-        import traceback
+    Returns:
+        The submission as a NormalizedArticle, or None if the message is not
+        a valid submission (the error is logged and counted)
+    """
+    from backend.metrics import INGEST_MESSAGES, observe_stage
+    from backend.services.ingest import InvalidPayload, decode_workflow_message
 
-        traceback.print_exc()
+    try:
+        # Parsed and validated in one pass, straight from the raw message
+        with observe_stage("parse"):
+            return decode_workflow_message(message)
+    except InvalidPayload as e:
+        logger.error(f"Invalid submit message: {e}")
+        INGEST_MESSAGES.labels("consumer", "failed").inc()
         return None
 
 
-async def process_message(message: str) -> bool:
+async def write_submissions(articles: List) -> List[bool]:
     """
-    Process a single message from the queue.
+    Write decoded submissions into staging with the shared ingest writer.
+
+    All articles are written in one transaction; if that fails they are
+    retried one at a time so a single bad article does not fail the rest.
 
     Args:
-        message: JSON message from Redis
+        articles: NormalizedArticles from decode_submission
 
     Returns:
-        True if processed successfully
+        Per-article success flags, in the same order as `articles`
     """
-    try:
-        data = json.loads(message)
-        action = data.get("action")
+    from backend.metrics import count_ingest_results, observe_stage
+    from backend.services.ingest import ingest_articles
 
-        if action == "submit":
-            article_id = await insert_article_to_staging(data)
-            if article_id:
-                logger.info(
-                    f"Successfully processed submission -> Staging ID: {article_id}"
-                )
-                return True
-            else:
-                logger.error("Failed to insert article into staging")
-                return False
-        else:
-            logger.warning(f"Unknown action: {action}")
-            return False
-
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in message: {e}")
-        return False
+    if not articles:
+        return []
+
+    try:
+        with observe_stage("db_write"):
+            results = await ingest_articles(articles)
     except Exception as e:
-        logger.error(f"Error processing message: {e}")
-        return False
+        # Fail the batch back to the caller so its messages are retried
+        logger.error(f"Error writing batch of {len(articles)} submission(s): {e}")
+        return [False] * len(articles)
+    count_ingest_results("consumer", results)
+
+    article_ids = [r.get("staging_article_id") for r in results]
+    logger.info(f"Batch of {len(articles)} submission(s) -> Staging IDs: {article_ids}")
+    for article, result in zip(articles, results):
+        if not result["success"]:
+            logger.error(
+                f"Failed to insert article {article.workflow_uuid}: {result['error']}"
+            )
+
+    return [result["success"] for result in results]
+
+
+async def process_batch(messages: List[str]) -> List[str]:
+    """
+    Process a batch of messages from the queue.
+
+    Valid submissions are written together in one transaction (see
+    write_submissions); messages that cannot be decoded fail on their own.
+
+    Args:
+        messages: JSON messages from Redis
+
+    Returns:
+        Per-message outcomes (PROCESSED, RETRY or INVALID), in the same order
+        as `messages`
+    """
+    results = [INVALID] * len(messages)
+    submissions = []  # (message index, article)
+
+    for i, message in enumerate(messages):
+        article = decode_submission(message)
+        if article is not None:
+            submissions.append((i, article))
+
+    written = await write_submissions([article for _, article in submissions])
+    for (i, _), ok in zip(submissions, written):
+        results[i] = PROCESSED if ok else RETRY
+
+    return results
 
 
 async def run_consumer():
@@ -323,15 +240,15 @@ async def run_consumer():
     while True:
         try:
             # Blocking pop with 5 second timeout
-            result = client.blpop(SUBMIT_QUEUE, timeout=5)
+            result = client.blpop(SUBMIT_QUEUE, timeout=BLPOP_TIMEOUT)
 
             if result:
                 queue_name, message = result
                 logger.info(f"Received message from {queue_name}")
 
-                success = await process_message(message)
+                outcome = await process_message(message)
 
-                if not success:
+                if outcome != PROCESSED:
                     # Optionally push failed messages to a dead letter queue
                     client.rpush(f"{SUBMIT_QUEUE}:failed", message)
                     logger.warning("Message moved to failed queue")
@@ -347,13 +264,261 @@ async def run_consumer():
     logger.info("Consumer shutdown complete")
 
 
+async def consumer_worker(
+    worker_id: int,
+    backend,
+    retries,
+    in_flight: asyncio.Semaphore,
+    stop: asyncio.Event,
+):
+    """
+    Worker task for the pooled consumer.
+
+    A worker only fetches a message once it holds an in-flight slot, so
+    messages never sit in process memory waiting for a free DB connection.
+
+    Args:
+        worker_id: Index of this worker (for logging)
+        backend: Queue backend shared by all workers
+        retries: RetryScheduler for failed messages
+        in_flight: Semaphore bounding concurrently processed messages
+        stop: Set when the consumer is shutting down
+    """
+    while not stop.is_set():
+        try:
+            async with in_flight:
+                message = await backend.fetch(worker_id, BLPOP_TIMEOUT)
+                if message is None:
+                    continue
+
+                logger.info(
+                    f"[worker {worker_id}] Received message from {SUBMIT_QUEUE}"
+                )
+
+                outcome = await process_message(message.payload)
+
+                if outcome == PROCESSED:
+                    await backend.ack(message)
+                elif outcome == INVALID:
+                    await backend.fail(message)
+                else:
+                    await retries.schedule(message)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"[worker {worker_id}] Consumer error: {e}")
+            await asyncio.sleep(1)  # Wait before retrying
+
+
+async def batch_consumer_worker(
+    worker_id: int,
+    backend,
+    retries,
+    in_flight: asyncio.Semaphore,
+    stop: asyncio.Event,
+):
+    """
+    Worker task for the batching consumer.
+
+    Each in-flight slot holds a whole batch: up to BATCH_SIZE messages
+    collected within BATCH_MAX_WAIT_MS and written in one transaction. Only
+    the messages that failed are scheduled for retry; invalid ones go
+    straight to the failed queue.
+
+    Args:
+        worker_id: Index of this worker (for logging)
+        backend: Queue backend shared by all workers
+        retries: RetryScheduler for failed messages
+        in_flight: Semaphore bounding concurrently processed batches
+        stop: Set when the consumer is shutting down
+    """
+    while not stop.is_set():
+        try:
+            async with in_flight:
+                messages = await backend.fetch_batch(
+                    worker_id, BATCH_SIZE, BATCH_MAX_WAIT_MS, BLPOP_TIMEOUT
+                )
+                if not messages:
+                    continue
+
+                logger.info(
+                    f"[worker {worker_id}] Received batch of {len(messages)} "
+                    f"message(s) from {SUBMIT_QUEUE}"
+                )
+
+                results = await process_batch([m.payload for m in messages])
+
+                by_outcome = {PROCESSED: [], RETRY: [], INVALID: []}
+                for message, outcome in zip(messages, results):
+                    by_outcome[outcome].append(message)
+                # Failures are recorded before anything is acknowledged, so
+                # a crash in between cannot strand them
+                await backend.fail_many(by_outcome[INVALID])
+                await retries.schedule_many(by_outcome[RETRY])
+                await backend.ack_many(by_outcome[PROCESSED])
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"[worker {worker_id}] Consumer error: {e}")
+            await asyncio.sleep(1)  # Wait before retrying
+
+
+async def refresh_queue_metrics(client, stop):
+    """Update queue depth gauges every QUEUE_DEPTH_INTERVAL until `stop` is set"""
+    from backend.metrics import refresh_queue_depths
+
+    while not stop.is_set():
+        try:
+            await refresh_queue_depths(client)
+        except Exception as e:
+            logger.error(f"Failed to read queue depths: {e}")
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=QUEUE_DEPTH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_consumer_pool(
+    workers: int = CONSUMER_WORKERS,
+    max_in_flight: int = CONSUMER_MAX_IN_FLIGHT,
+    worker=consumer_worker,
+    staged: bool = False,
+):
+    """
+    Pooled consumer loop.
+
+    Runs `workers` concurrent worker tasks on redis.asyncio, sharing a
+    semaphore that bounds in-flight messages and a Postgres connection pool
+    sized to match, so throughput is limited by the database rather than by
+    per-message latency.
+
+    Args:
+        workers: Number of concurrent worker tasks
+        max_in_flight: Maximum number of messages (or batches) processed at once
+        worker: Worker coroutine function run by each task
+        staged: Run the staged pipeline instead, with `workers` fetchers
+            and `max_in_flight` writers
+    """
+    import signal
+
+    from backend.db.tables import StagingArticleTable
+    from backend.metrics import register_pool
+    from backend.services.queue_backends import get_queue_backend
+    from backend.services.retry import RetryScheduler
+
+    if max_in_flight < 1:
+        raise ValueError(f"max_in_flight must be at least 1, got {max_in_flight}")
+
+    # One Redis connection per worker (its fetch, then its acks), plus one
+    # per writer and for the decoder when staged, plus the background tasks
+    connections = workers + BACKGROUND_REDIS_TASKS
+    if staged:
+        connections += max_in_flight + 1
+    client = get_async_redis_client(max_connections=connections)
+
+    logger.info(
+        f"Starting pooled queue consumer for: {SUBMIT_QUEUE} "
+        f"(backend={QUEUE_BACKEND}, workers={workers}, max_in_flight={max_in_flight})"
+    )
+    logger.info(f"Redis: {REDIS_HOST}:{REDIS_PORT}")
+
+    try:
+        await client.ping()
+        logger.info("Redis connection OK")
+    except Exception as e:
+        logger.error(f"Redis connection failed: {e}")
+        await client.aclose()
+        return
+
+    backend = get_queue_backend(QUEUE_BACKEND, client, SUBMIT_QUEUE)
+    await backend.setup()
+    retries = RetryScheduler(backend)
+
+    engine = StagingArticleTable._meta.db
+    await engine.start_connection_pool(
+        min_size=min(DB_POOL_MIN_SIZE, max_in_flight), max_size=max_in_flight
+    )
+    register_pool("staging", lambda: engine.pool)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    if staged:
+        from backend.services.staged_consumer import StagedConsumer
+
+        consumer = StagedConsumer(backend, retries, workers, max_in_flight)
+        tasks = [asyncio.create_task(consumer.run(stop))]
+    else:
+        in_flight = asyncio.Semaphore(max_in_flight)
+        tasks = [
+            asyncio.create_task(worker(i, backend, retries, in_flight, stop))
+            for i in range(workers)
+        ]
+    tasks.append(asyncio.create_task(backend.run_maintenance(stop)))
+    tasks.append(asyncio.create_task(retries.run(stop)))
+    if CONSUMER_METRICS_PORT:
+        tasks.append(asyncio.create_task(refresh_queue_metrics(client, stop)))
+
+    try:
+        await stop.wait()
+        logger.info("Consumer stopping, waiting for in-flight messages")
+        # Workers exit after their current BLPOP/message completes
+        await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await engine.close_connection_pool()
+        await client.aclose()
+        logger.info("Consumer shutdown complete")
+
+
+async def print_queue_stats():
+    """Print queue depth and per-consumer pending counts for QUEUE_BACKEND"""
+    from backend.services.queue_backends import get_queue_backend
+    from backend.services.retry import retry_key
+
+    client = get_async_redis_client()
+    try:
+        backend = get_queue_backend(QUEUE_BACKEND, client, SUBMIT_QUEUE)
+        stats = await backend.stats()
+        stats["retrying"] = await client.zcard(retry_key(SUBMIT_QUEUE))
+        print(json.dumps(stats, indent=2))
+    finally:
+        await client.aclose()
+
+
+async def main():
+    """Run the consumer selected by CONSUMER_MODE"""
+    if CONSUMER_METRICS_PORT:
+        from backend.metrics import start_metrics_server
+
+        start_metrics_server(CONSUMER_METRICS_PORT)
+        logger.info(f"Metrics on :{CONSUMER_METRICS_PORT}/metrics")
+
+    if CONSUMER_MODE == "pool":
+        await run_consumer_pool()
+    elif CONSUMER_MODE == "batch":
+        await run_consumer_pool(worker=batch_consumer_worker)
+    elif CONSUMER_MODE == "pipeline":
+        await run_consumer_pool(workers=PIPELINE_FETCHERS, staged=True)
+    else:
+        await run_consumer()
+
+
 if __name__ == "__main__":
+    if sys.argv[1:] == ["stats"]:
+        asyncio.run(print_queue_stats())
+        sys.exit(0)
+
     print("=" * 60)
     print(" ProvenPick Staging Queue Consumer")
     print("=" * 60)
     print(f" Queue: {SUBMIT_QUEUE}")
     print(f" Redis: {REDIS_HOST}:{REDIS_PORT}")
+    print(f" Mode:  {CONSUMER_MODE}")
     print("=" * 60)
     print()
 
-    asyncio.run(run_consumer())
+    asyncio.run(main())
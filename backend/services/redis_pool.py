@@ -0,0 +1,109 @@
+"""
+Shared asyncio Redis client for the API process.
+
+One connection pool, opened and closed by the FastAPI lifespan, backs every
+Redis producer in the API: submit jobs, rejection publishing and the
+/metrics queue depths. Publishes that target several queues are sent as
+one pipeline, so they cost a single round trip.
+
+The queue consumer runs in its own process and keeps its own clients
+(backend.services.queue_consumer).
+"""
+
+import logging
+import os
+from typing import List, NamedTuple, Optional
+
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+# Overrides REDIS_HOST/REDIS_PORT when set
+REDIS_URL = os.getenv("REDIS_URL")
+# Connections shared by the API process; each submit job worker holds one
+# while it blocks waiting for jobs
+REDIS_POOL_MAX_CONNECTIONS = int(os.getenv("REDIS_POOL_MAX_CONNECTIONS", "32"))
+# Seconds a caller waits for a free connection before failing
+REDIS_POOL_TIMEOUT = int(os.getenv("REDIS_POOL_TIMEOUT", "5"))
+
+_client: Optional[aioredis.Redis] = None
+
+
+class QueuePush(NamedTuple):
+    """One message for push_to_queues"""
+
+    queue: str
+    payload: str
+    # LPUSH instead of RPUSH, for consumers that pop from the right
+    left: bool = False
+
+
+def create_pool() -> aioredis.BlockingConnectionPool:
+    """Connection pool that waits for a free connection instead of failing"""
+    options = {
+        "max_connections": REDIS_POOL_MAX_CONNECTIONS,
+        "timeout": REDIS_POOL_TIMEOUT,
+        "decode_responses": True,
+    }
+    if REDIS_URL:
+        return aioredis.BlockingConnectionPool.from_url(REDIS_URL, **options)
+    return aioredis.BlockingConnectionPool(host=REDIS_HOST, port=REDIS_PORT, **options)
+
+
+def get_redis() -> aioredis.Redis:
+    """
+    The shared Redis client.
+
+    Created on first use when the lifespan has not started it (scripts).
+    """
+    global _client
+
+    if _client is None:
+        _client = aioredis.Redis(connection_pool=create_pool())
+    return _client
+
+
+async def start_redis():
+    """Open the shared pool (lifespan startup)"""
+    get_redis()
+
+
+async def close_redis():
+    """Close the shared client and its connections (lifespan shutdown)"""
+    global _client
+
+    if _client is not None:
+        await _client.aclose(close_connection_pool=True)
+        _client = None
+
+
+async def push_to_queues(pushes: List[QueuePush]) -> bool:
+    """
+    Push messages onto one or more queues in a single round trip.
+
+    Best effort: failures are logged, never raised.
+
+    Args:
+        pushes: Messages to push, in order
+
+    Returns:
+        True if every push succeeded
+    """
+    if not pushes:
+        return True
+
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for push in pushes:
+                if push.left:
+                    pipe.lpush(push.queue, push.payload)
+                else:
+                    pipe.rpush(push.queue, push.payload)
+            await pipe.execute()
+        return True
+    except Exception as e:
+        queues = ", ".join(sorted({push.queue for push in pushes}))
+        logger.warning(f"Failed to push to Redis ({queues}): {e}")
+        return False
@@ -5,49 +5,58 @@ Handles the process of rejecting staging articles and queuing them for AI reproc
 
 import os
 import json
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
-import redis
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, List, Optional
 from backend.db.tables import (
+    PENDING_REJECTIONS,
     StagingArticleTable,
     RejectionQueueTable,
     ArchiveTable,
 )
+from backend.metrics import observe_stage
+from backend.services.dedupe import recent_uuids
+from backend.services.events import publish_events
+from backend.services.notifications import (
+    REJECTIONS_CHANNEL,
+    listener,
+    notify,
+    wait_for_notification,
+)
 from backend.services.approval import (
     fetch_full_staging_article,
     delete_staging_data,
     archive_staging_data,
+    rejection_event,
 )
+from backend.services.redis_pool import QueuePush, push_to_queues
 
-# Redis configuration (should match workflow config)
-REDIS_HOST = os.environ.get("REDIS_HOST", "localhost")
-REDIS_PORT = int(os.environ.get("REDIS_PORT", 6379))
+# Redis queue (should match workflow config)
 REDIS_REJECTION_QUEUE = "provenpick:rejections"
 
-
-def get_redis_client():
-    """Get Redis client for queue operations"""
-    return redis.Redis(host=REDIS_HOST, port=REDIS_PORT, decode_responses=True)
-
-
-async def push_to_redis_queue(rejection_data: Dict[str, Any]) -> bool:
-    """
-    Push rejection to Redis queue for workflow to process.
-
-    Args:
-        rejection_data: Rejection data to push
-
-    Returns:
-        True if successful
-    """
-    try:
-        client = get_redis_client()
-        client.rpush(REDIS_REJECTION_QUEUE, json.dumps(rejection_data, default=str))
-        client.close()
-        return True
-    except Exception as e:
-        print(f"Failed to push to Redis: {e}")
-        return False
+# Longest long-poll accepted by GET /api/pipeline/rejections?wait=
+REJECTION_WAIT_MAX = int(os.environ.get("REJECTION_WAIT_MAX", 60))
+# Re-check interval while LISTEN is unavailable
+REJECTION_POLL_INTERVAL = 1
+# Seconds a claimed rejection stays leased to its worker unless acked
+REJECTION_LEASE_SECONDS = int(os.environ.get("REJECTION_LEASE_SECONDS", 300))
+# Most rejections one claim may return
+REJECTION_CLAIM_MAX = int(os.environ.get("REJECTION_CLAIM_MAX", 100))
+
+# Characters per chunk of a streamed rejection snapshot, and chunks the
+# cursor reads ahead
+SNAPSHOT_CHUNK_SIZE = 64 * 1024
+SNAPSHOT_PREFETCH = 4
+
+# Fields listed by default; the full article_data snapshot is fetched per
+# rejection (GET /api/pipeline/rejections/{id}/snapshot)
+REJECTION_SUMMARY_FIELDS = (
+    "rejection_id",
+    "staging_article_id",
+    "workflow_uuid",
+    "reviewer_comments",
+    "rejected_at",
+)
 
 
 async def add_to_rejection_queue(
@@ -124,7 +133,14 @@ async def reject_article(
             workflow_uuid=workflow_uuid,
         )
 
-        # 3. Push to Redis queue for workflow to process
+        # Wake long-polling pipeline clients
+        try:
+            await notify(REJECTIONS_CHANNEL, str(rejection_id))
+        except Exception as e:
+            print(f"Failed to notify rejection listeners: {e}")
+
+        # 3. Push to the workflow's Redis queue and publish the rejection
+        # event, in one round trip
         redis_data = {
             "rejection_id": rejection_id,
             "staging_article_id": staging_article_id,
@@ -133,19 +149,37 @@ async def reject_article(
             "rejected_at": datetime.now().isoformat(),
             "rejected_by": reviewer_token,
         }
-        await push_to_redis_queue(redis_data)
+        await push_to_queues(
+            [
+                QueuePush(REDIS_REJECTION_QUEUE, json.dumps(redis_data, default=str)),
+                rejection_event(staging_article_id, full_data, comments),
+            ]
+        )
 
         # 4. Archive the staging data
-        archive_id = await archive_staging_data(
-            staging_article_id=staging_article_id,
-            full_data=full_data,
-            action="rejected",
-            comments=comments,
-        )
+        with observe_stage("archive"):
+            archive_id = await archive_staging_data(
+                staging_article_id=staging_article_id,
+                full_data=full_data,
+                action="rejected",
+                comments=comments,
+            )
 
         # 5. Delete from staging
         product_ids = list(full_data["products"].keys())
         await delete_staging_data(staging_article_id, product_ids)
+        recent_uuids.discard(workflow_uuid)
+
+        await publish_events(
+            [
+                {
+                    "type": "rejected",
+                    "staging_article_id": staging_article_id,
+                    "workflow_uuid": workflow_uuid,
+                    "rejection_id": rejection_id,
+                }
+            ]
+        )
 
         return {
             "success": True,
@@ -158,21 +192,131 @@ async def reject_article(
         return {"success": False, "error": str(e)}
 
 
-async def get_pending_rejections() -> List[Dict[str, Any]]:
+async def get_pending_rejections(
+    fields: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
     """
     Get all pending items in rejection queue (for AI pipeline to poll).
 
+    Args:
+        fields: Columns to return (see rejection_fields); all if None
+
     Returns:
         List of rejection queue items
     """
+    columns = [RejectionQueueTable._meta.get_column_by_name(f) for f in fields or []]
     return (
-        await RejectionQueueTable.select()
-        .where(RejectionQueueTable.processed_by_pipeline == False)
+        await RejectionQueueTable.select(*columns)
+        .where(PENDING_REJECTIONS)
         .order_by(RejectionQueueTable.rejected_at)
         .run()
     )
 
 
+def rejection_fields(fields: Optional[str]) -> List[str]:
+    """
+    Parse a comma-separated rejection field projection.
+
+    Args:
+        fields: e.g. "workflow_uuid,reviewer_comments"; None or "" selects
+            REJECTION_SUMMARY_FIELDS
+
+    Returns:
+        Column names, always starting with rejection_id
+
+    Raises:
+        ValueError: If a field is not a rejection_queue column
+    """
+    if not fields:
+        return list(REJECTION_SUMMARY_FIELDS)
+
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    known = {column._meta.name for column in RejectionQueueTable._meta.columns}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown rejection field(s): {', '.join(unknown)}")
+
+    return ["rejection_id"] + [n for n in dict.fromkeys(names) if n != "rejection_id"]
+
+
+async def claim_rejections(
+    owner: str,
+    limit: int,
+    lease_seconds: int = REJECTION_LEASE_SECONDS,
+    fields: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Lease pending rejections to one pipeline worker.
+
+    Rows are locked with FOR UPDATE SKIP LOCKED, so concurrent claims never
+    return the same rejection and never wait on each other. A lease that
+    expires without an ack makes the rejection claimable again.
+
+    Args:
+        owner: Worker ID the lease is recorded under
+        limit: Most rejections to claim
+        lease_seconds: Lease duration
+        fields: Columns to return (see rejection_fields); all if None
+
+    Returns:
+        Claimed rejection queue items, oldest first
+    """
+    # Only validated column names are interpolated
+    columns = ", ".join(fields) if fields else "*"
+    query = """
+        WITH claimed AS (
+            UPDATE staging.rejection_queue AS r
+            SET lease_owner = {},
+                lease_expires_at = NOW() + {}::int * INTERVAL '1 second'
+            FROM (
+                SELECT rejection_id
+                FROM staging.rejection_queue
+                WHERE processed_by_pipeline = FALSE
+                  AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+                ORDER BY rejected_at
+                LIMIT {}
+                FOR UPDATE SKIP LOCKED
+            ) AS claimable
+            WHERE r.rejection_id = claimable.rejection_id
+            RETURNING r.*
+        )
+        """
+    query += f"SELECT {columns} FROM claimed ORDER BY rejected_at"
+
+    return await RejectionQueueTable.raw(query, owner, lease_seconds, limit).run()
+
+
+async def wait_for_rejections(
+    timeout: float,
+    fetch: Optional[Callable[[], Awaitable[List[Dict[str, Any]]]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Long-poll for pending rejections.
+
+    Returns as soon as there are pending rejections, waking on the NOTIFY
+    sent by reject_article instead of re-querying in a loop.
+
+    Args:
+        timeout: Seconds to wait if nothing is pending
+        fetch: Reads the rejections to return (default: get_pending_rejections)
+
+    Returns:
+        Pending rejections (empty if the timeout ran out)
+    """
+    fetch = fetch or get_pending_rejections
+    deadline = time.monotonic() + timeout
+
+    while True:
+        # Taken before querying so a rejection in between still wakes us
+        event = listener.event(REJECTIONS_CHANNEL)
+        rejections = await fetch()
+        remaining = deadline - time.monotonic()
+        if rejections or remaining <= 0:
+            return rejections
+
+        await wait_for_notification(event, remaining, REJECTION_POLL_INTERVAL)
+
+
 async def mark_rejection_processed(rejection_id: int) -> bool:
     """
     Mark a rejection as processed by AI pipeline.
@@ -181,17 +325,109 @@ async def mark_rejection_processed(rejection_id: int) -> bool:
         rejection_id: ID of the rejection queue item
 
     Returns:
-        True if successful
-    """
-    await (
-        RejectionQueueTable.update(
-            {
-                RejectionQueueTable.processed_by_pipeline: True,
-                RejectionQueueTable.processed_at: datetime.now(),
-            }
-        )
-        .where(RejectionQueueTable.rejection_id == rejection_id)
-        .run()
+        True if the rejection exists
+    """
+    return bool(await mark_rejections_processed([rejection_id]))
+
+
+async def mark_rejections_processed(rejection_ids: List[int]) -> List[int]:
+    """
+    Mark many rejections as processed in one UPDATE.
+
+    Acking a rejection again keeps its original processed_at.
+
+    Args:
+        rejection_ids: IDs of rejection queue items
+
+    Returns:
+        The IDs that exist, in ascending order
+    """
+    if not rejection_ids:
+        return []
+
+    rows = await RejectionQueueTable.raw(
+        """
+        UPDATE staging.rejection_queue
+        SET processed_by_pipeline = TRUE,
+            processed_at = COALESCE(processed_at, {})
+        WHERE rejection_id = ANY({}::int[])
+        RETURNING rejection_id
+        """,
+        datetime.now(),
+        list(set(rejection_ids)),
+    ).run()
+
+    acked = sorted(row["rejection_id"] for row in rows)
+    await publish_events(
+        [{"type": "rejection_acked", "rejection_id": rid} for rid in acked]
     )
+    return acked
+
+
+async def get_rejection_snapshot(rejection_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Get the ETag and size of a rejection's full article snapshot.
+
+    Both are computed by the database, so the snapshot itself is not
+    loaded; stream it with iter_rejection_snapshot.
+
+    Args:
+        rejection_id: ID of the rejection queue item
+
+    Returns:
+        {"etag": ..., "size": bytes of the JSON text}, or None if the
+        rejection does not exist
+    """
+    rows = await RejectionQueueTable.raw(
+        """
+        SELECT md5(article_data::text) AS etag,
+               octet_length(article_data::text) AS size
+        FROM staging.rejection_queue
+        WHERE rejection_id = {}
+        """,
+        rejection_id,
+    ).run()
+    return rows[0] if rows else None
+
+
+async def iter_rejection_snapshot(
+    rejection_id: int, chunk_size: int = SNAPSHOT_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Stream a rejection's article snapshot as stored (JSON text).
 
-    return True
+    The text is rendered once in the database and read through a cursor
+    a chunk at a time, so at most a chunk is held in memory.
+
+    Args:
+        rejection_id: ID of the rejection queue item
+        chunk_size: Characters per chunk
+    """
+    engine = RejectionQueueTable._meta.db
+    pool = engine.pool
+    connection = await (pool.acquire() if pool else engine.get_new_connection())
+    try:
+        async with connection.transaction():
+            # MATERIALIZED: render the JSON once, not once per chunk
+            cursor = connection.cursor(
+                """
+                WITH snapshot AS MATERIALIZED (
+                    SELECT article_data::text AS data
+                    FROM staging.rejection_queue
+                    WHERE rejection_id = $1
+                )
+                SELECT substr(data, start, $2) AS chunk
+                FROM snapshot, generate_series(1, length(data), $2) AS start
+                ORDER BY start
+                """,
+                rejection_id,
+                chunk_size,
+                prefetch=SNAPSHOT_PREFETCH,
+            )
+            async for row in cursor:
+                yield row["chunk"].encode()
+    finally:
+        if pool:
+            await pool.release(connection)
+        else:
+            await connection.close()
@@ -0,0 +1,185 @@
+"""
+Delayed retries for failed submit messages.
+
+A message that fails processing is parked in a Redis sorted set scored by
+the time it becomes due again, with exponential backoff and jitter. The
+number of attempts travels with the message in its "_attempt" field; once
+RETRY_MAX_ATTEMPTS is reached (or the message can never succeed, e.g. it is
+not valid JSON) it goes to the `{queue}:failed` dead-letter list instead.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from typing import List, Optional, Tuple
+
+from backend.services.queue_backends import STREAM_FIELD
+
+logger = logging.getLogger(__name__)
+
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "5"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "30"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "3600"))
+RETRY_POLL_INTERVAL = float(os.getenv("RETRY_POLL_INTERVAL", "5"))
+# Upper bound on messages moved back to the queue per poll, so a large
+# backlog of due retries is released gradually
+RETRY_RELEASE_LIMIT = int(os.getenv("RETRY_RELEASE_LIMIT", "100"))
+
+ATTEMPT_FIELD = "_attempt"
+
+# Moves due retries back to the queue (list) or stream atomically.
+# KEYS: retry zset, target. ARGV: now, limit, target type, stream field
+RELEASE_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, payload in ipairs(due) do
+    redis.call('ZREM', KEYS[1], payload)
+    if ARGV[3] == 'stream' then
+        redis.call('XADD', KEYS[2], '*', ARGV[4], payload)
+    else
+        redis.call('RPUSH', KEYS[2], payload)
+    end
+end
+return #due
+"""
+
+
+def retry_key(queue: str) -> str:
+    """Sorted set holding scheduled retries for a submit queue"""
+    return f"{queue}:retry"
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Delay before retry number `attempt` (1-based).
+
+    Exponential backoff capped at RETRY_MAX_DELAY, with the upper half
+    randomised so retries of a failed burst do not come back together.
+    """
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
+
+
+def next_attempt(payload: str) -> Tuple[Optional[str], int]:
+    """
+    Prepare a failed message for its next attempt.
+
+    Args:
+        payload: Message as read from the queue
+
+    Returns:
+        (payload with the attempt count incremented, attempt number), or
+        (None, 0) if the message can never succeed
+    """
+    try:
+        data = json.loads(payload)
+    except json.JSONDecodeError:
+        return None, 0
+
+    if not isinstance(data, dict) or data.get("action") != "submit":
+        return None, 0
+
+    attempt = int(data.get(ATTEMPT_FIELD, 0)) + 1
+    data[ATTEMPT_FIELD] = attempt
+    return json.dumps(data), attempt
+
+
+def reset_attempts(payload: str) -> str:
+    """Message with its attempt count cleared, for manual replay"""
+    try:
+        data = json.loads(payload)
+    except json.JSONDecodeError:
+        return payload
+
+    if isinstance(data, dict) and ATTEMPT_FIELD in data:
+        del data[ATTEMPT_FIELD]
+        return json.dumps(data)
+    return payload
+
+
+class RetryScheduler:
+    """Schedules failed messages for retry and releases them when due"""
+
+    def __init__(self, backend, max_attempts: int = RETRY_MAX_ATTEMPTS):
+        self.backend = backend
+        self.client = backend.client
+        self.max_attempts = max_attempts
+        self.retry_key = retry_key(backend.queue)
+        self._release_due = self.client.register_script(RELEASE_DUE_SCRIPT)
+
+    async def schedule_many(self, messages: List) -> int:
+        """
+        Schedule failed messages for retry, dead-lettering poison messages.
+
+        The original messages are acknowledged once their retry (or
+        dead-letter entry) has been recorded.
+
+        Args:
+            messages: Failed QueueMessages
+
+        Returns:
+            Number of messages scheduled for retry
+        """
+        if not messages:
+            return 0
+
+        now = time.time()
+        retries = {}
+        dead = []
+        for message in messages:
+            payload, attempt = next_attempt(message.payload)
+            if payload is None or attempt > self.max_attempts:
+                dead.append(message.payload)
+            else:
+                retries[payload] = now + backoff_delay(attempt)
+
+        async with self.client.pipeline(transaction=True) as pipe:
+            if retries:
+                pipe.zadd(self.retry_key, retries)
+            if dead:
+                pipe.rpush(self.backend.failed_queue, *dead)
+            await pipe.execute()
+
+        await self.backend.ack_many(messages)
+
+        if dead:
+            logger.warning(
+                f"{len(dead)} message(s) moved to failed queue "
+                f"(poison or after {self.max_attempts} attempts)"
+            )
+        if retries:
+            logger.info(f"{len(retries)} message(s) scheduled for retry")
+        return len(retries)
+
+    async def schedule(self, message) -> bool:
+        """Schedule one failed message; returns False if it was dead-lettered"""
+        return await self.schedule_many([message]) == 1
+
+    async def release_due(self, limit: int = RETRY_RELEASE_LIMIT) -> int:
+        """
+        Move retries whose backoff has elapsed back onto the queue.
+
+        Returns:
+            Number of messages released
+        """
+        target, target_type = self.backend.enqueue_target
+        return await self._release_due(
+            keys=[self.retry_key, target],
+            args=[time.time(), limit, target_type, STREAM_FIELD],
+        )
+
+    async def run(self, stop):
+        """Release due retries every RETRY_POLL_INTERVAL until `stop` is set"""
+        while not stop.is_set():
+            try:
+                released = await self.release_due()
+                if released:
+                    logger.info(f"Released {released} message(s) for retry")
+            except Exception as e:
+                logger.error(f"Retry scheduler error: {e}")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=RETRY_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,274 @@
+"""
+Staged submit queue consumer.
+
+Consumption is split into three stages connected by bounded asyncio queues:
+
+    fetch -> decode/validate -> write
+
+Fetchers pull batches from the queue backend, the decoder parses and
+validates them and moves large content into the blob store, and writers
+commit them to staging. While the writers wait on the database the decoder
+is already preparing the next batches, and because the queues are bounded a
+slow stage makes the stages before it wait instead of piling up messages in
+memory. Each stage reports how full its input queue is and how many of its
+workers are busy, so the bottleneck is visible in the logs and metrics.
+"""
+
+import asyncio
+import logging
+import os
+from typing import List, Tuple
+
+from backend.metrics import INGEST_MESSAGES, PIPELINE_BUSY, PIPELINE_QUEUED
+from backend.services.dedupe import find_existing_articles, recent_uuids
+from backend.services.ingest import NormalizedArticle, store_article_blobs
+from backend.services.queue_backends import QueueMessage
+from backend.services.queue_consumer import (
+    BATCH_MAX_WAIT_MS,
+    BATCH_SIZE,
+    BLPOP_TIMEOUT,
+    decode_submission,
+    write_submissions,
+)
+
+logger = logging.getLogger(__name__)
+
+# Batches each stage may have waiting before the previous stage blocks
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))
+# Seconds between occupancy log lines
+PIPELINE_REPORT_INTERVAL = int(os.getenv("PIPELINE_REPORT_INTERVAL", "30"))
+
+DecodedBatch = List[Tuple[QueueMessage, NormalizedArticle]]
+
+
+class StagedConsumer:
+    """Runs the fetch, decode and write stages until stopped"""
+
+    def __init__(
+        self,
+        backend,
+        retries,
+        fetchers: int,
+        writers: int,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+    ):
+        """
+        Args:
+            backend: Queue backend to consume from
+            retries: RetryScheduler for failed messages
+            fetchers: Number of fetch tasks
+            writers: Number of write tasks (concurrent DB transactions)
+            queue_size: Capacity of each stage's input queue, in batches
+        """
+        self.backend = backend
+        self.retries = retries
+        self.fetchers = fetchers
+        self.writers = writers
+        self.queues = {
+            "decode": asyncio.Queue(maxsize=queue_size),
+            "write": asyncio.Queue(maxsize=queue_size),
+        }
+        self.workers = {"decode": 1, "write": writers}
+        self.busy = {"decode": 0, "write": 0}
+
+    def _publish(self):
+        """Update the occupancy gauges"""
+        for stage, queue in self.queues.items():
+            PIPELINE_QUEUED.labels(stage).set(queue.qsize())
+            PIPELINE_BUSY.labels(stage).set(self.busy[stage])
+
+    async def _put(self, stage: str, item):
+        await self.queues[stage].put(item)
+        self._publish()
+
+    async def _get(self, stage: str):
+        item = await self.queues[stage].get()
+        self._publish()
+        return item
+
+    def _set_busy(self, stage: str, delta: int):
+        self.busy[stage] += delta
+        self._publish()
+
+    async def fetch(self, fetcher_id: int, stop: asyncio.Event):
+        """Fetch stage: pull batches until `stop` is set"""
+        while not stop.is_set():
+            try:
+                messages = await self.backend.fetch_batch(
+                    fetcher_id, BATCH_SIZE, BATCH_MAX_WAIT_MS, BLPOP_TIMEOUT
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[fetch {fetcher_id}] Fetch error: {e}")
+                await asyncio.sleep(1)  # Wait before retrying
+                continue
+
+            if messages:
+                # Blocks while the decoder is behind
+                await self._put("decode", messages)
+
+    async def decode(self):
+        """Decode stage: runs until it receives None"""
+        while True:
+            messages = await self._get("decode")
+            if messages is None:
+                break
+
+            self._set_busy("decode", 1)
+            try:
+                batch = await self.decode_batch(messages)
+            except Exception as e:
+                logger.error(f"[decode] Error decoding batch: {e}")
+                batch = []
+                await self._fail(messages)
+            finally:
+                self._set_busy("decode", -1)
+
+            if batch:
+                await self._put("write", batch)
+
+    async def decode_batch(self, messages: List[QueueMessage]) -> DecodedBatch:
+        """
+        Decode and validate a fetched batch.
+
+        Invalid messages go straight to the failed queue, messages whose
+        content could not be stored are scheduled for retry, re-deliveries of articles still in staging are
+        acknowledged right away, and large content of the rest is moved into
+        the blob store so writers only do database work.
+
+        Args:
+            messages: Fetched messages
+
+        Returns:
+            (message, article) pairs to write
+        """
+        decoded = []
+        invalid = []
+        for message in messages:
+            article = decode_submission(message.payload)
+            if article is None:
+                invalid.append(message)
+            else:
+                decoded.append((message, article))
+
+        # Cache hits are likely re-deliveries; confirm them in one lookup
+        hinted = [
+            article.workflow_uuid
+            for _, article in decoded
+            if article.workflow_uuid
+            and recent_uuids.get(article.workflow_uuid) is not None
+        ]
+        existing = await find_existing_articles(hinted) if hinted else {}
+
+        batch = []
+        retry = []
+        duplicates = []
+        for message, article in decoded:
+            if article.workflow_uuid in existing:
+                duplicates.append(message)
+                continue
+
+            try:
+                batch.append((message, await store_article_blobs(article)))
+            except Exception as e:
+                logger.error(f"[decode] Failed to store content: {e}")
+                retry.append(message)
+
+        if invalid:
+            await self.backend.fail_many(invalid)
+        if retry:
+            await self.retries.schedule_many(retry)
+        if duplicates:
+            logger.info(f"[decode] Skipping {len(duplicates)} duplicate submission(s)")
+            INGEST_MESSAGES.labels("consumer", "duplicate").inc(len(duplicates))
+            await self.backend.ack_many(duplicates)
+
+        return batch
+
+    async def write(self, writer_id: int):
+        """Write stage: runs until it receives None"""
+        while True:
+            batch = await self._get("write")
+            if batch is None:
+                break
+
+            self._set_busy("write", 1)
+            try:
+                results = await write_submissions([article for _, article in batch])
+                # Retries first, so failures are recorded before acks
+                await self.retries.schedule_many(
+                    [m for (m, _), ok in zip(batch, results) if not ok]
+                )
+                await self.backend.ack_many(
+                    [m for (m, _), ok in zip(batch, results) if ok]
+                )
+            except Exception as e:
+                logger.error(f"[write {writer_id}] Error writing batch: {e}")
+                await self._fail([m for m, _ in batch])
+            finally:
+                self._set_busy("write", -1)
+
+    async def _fail(self, messages: List[QueueMessage]):
+        """Schedule messages for retry after an unexpected stage error"""
+        try:
+            await self.retries.schedule_many(messages)
+        except Exception as e:
+            # Reliable/stream backends re-deliver unacknowledged messages
+            logger.error(
+                f"Failed to schedule {len(messages)} message(s) for retry: {e}"
+            )
+
+    def bottleneck(self) -> str:
+        """
+        Stage currently limiting throughput.
+
+        The first stage (from the end) whose input queue is full is holding
+        everything before it back; if no queue is full the consumer is
+        waiting on the submit queue itself.
+        """
+        for stage in ("write", "decode"):
+            if self.queues[stage].full():
+                return stage
+        return "fetch"
+
+    def occupancy(self) -> str:
+        """One-line summary of queued batches and busy workers per stage"""
+        parts = [
+            f"{stage}: {queue.qsize()}/{queue.maxsize} queued, "
+            f"{self.busy[stage]}/{self.workers[stage]} busy"
+            for stage, queue in self.queues.items()
+        ]
+        return "; ".join(parts) + f" (bottleneck: {self.bottleneck()})"
+
+    async def report(self, stop: asyncio.Event):
+        """Log occupancy every PIPELINE_REPORT_INTERVAL until `stop` is set"""
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=PIPELINE_REPORT_INTERVAL)
+            except asyncio.TimeoutError:
+                logger.info(f"Pipeline {self.occupancy()}")
+
+    async def run(self, stop: asyncio.Event):
+        """
+        Run all stages until `stop` is set.
+
+        Once fetchers stop, every batch already fetched is decoded and
+        written before this returns.
+        """
+        fetchers = [
+            asyncio.create_task(self.fetch(i, stop)) for i in range(self.fetchers)
+        ]
+        decoder = asyncio.create_task(self.decode())
+        writers = [asyncio.create_task(self.write(i)) for i in range(self.writers)]
+        reporter = asyncio.create_task(self.report(stop))
+
+        await asyncio.gather(*fetchers, return_exceptions=True)
+
+        # Drain the pipeline stage by stage
+        await self._put("decode", None)
+        await decoder
+        for _ in writers:
+            await self._put("write", None)
+        await asyncio.gather(*writers, return_exceptions=True)
+        await reporter
@@ -7,6 +7,9 @@ import httpx
 from typing import Optional, List, Dict
 from frontend.state import AppState
 
+# Matches backend.services.blob_store.BLOB_REF_PREFIX
+BLOB_REF_PREFIX = "blob:sha256:"
+
 
 class ProductImage(rx.Base):
     """Product image model"""
@@ -201,6 +204,12 @@ class ReviewState(AppState):
         except ValueError:
             self.error = f"Invalid article ID: {article_id_str}"
 
+    def resolve_blob_url(self, url: str) -> str:
+        """Turn a blob reference into the API URL that serves it"""
+        if url and url.startswith(BLOB_REF_PREFIX):
+            return f"{self.api_url}/api/blobs/{url[len(BLOB_REF_PREFIX):]}"
+        return url
+
     async def load_article(self, article_id: int):
         """Load and transform article to match main app structure"""
         self.loading = True
@@ -221,6 +230,16 @@ class ReviewState(AppState):
                     article_images = data.get("article_images", [])
                     article_texts = data.get("article_texts", [])
 
+                    # Large images and texts are stored as blob references
+                    for img in article_images:
+                        img["image_url"] = self.resolve_blob_url(img["image_url"])
+                    for txt in article_texts:
+                        if txt["content"].startswith(BLOB_REF_PREFIX):
+                            blob = await client.get(
+                                self.resolve_blob_url(txt["content"])
+                            )
+                            txt["content"] = blob.text
+
                     # Find specific images
                     hook_img = next(
                         (
@@ -304,7 +323,14 @@ class ReviewState(AppState):
                             if isinstance(prod_data.get("affiliate_links"), dict)
                             else {},
                             images=[
-                                ProductImage(**img)
+                                ProductImage(
+                                    **{
+                                        **img,
+                                        "image_url": self.resolve_blob_url(
+                                            img["image_url"]
+                                        ),
+                                    }
+                                )
                                 for img in prod_data.get("images", [])
                             ],
                             texts=[
@@ -0,0 +1,66 @@
+"""
+Make staging_article.workflow_uuid unique.
+ID: 2026-10-16T10:00:00:000000
+"""
+
+from piccolo.apps.migrations.auto.migration_manager import MigrationManager
+from piccolo.table import Table
+
+
+ID = "2026-10-16T10:00:00:000000"
+VERSION = "1.30.0"
+DESCRIPTION = "Unique workflow_uuid on staging_article"
+
+
+class RawTable(Table):
+    pass
+
+
+async def forwards():
+    manager = MigrationManager(
+        migration_id=ID, app_name="backend", description=DESCRIPTION
+    )
+
+    async def run():
+        duplicates = await RawTable.raw(
+            """
+            SELECT workflow_uuid, COUNT(*) AS copies
+            FROM staging.staging_article
+            WHERE workflow_uuid IS NOT NULL
+            GROUP BY workflow_uuid
+            HAVING COUNT(*) > 1
+            """
+        )
+        if duplicates:
+            uuids = ", ".join(row["workflow_uuid"] for row in duplicates)
+            raise ValueError(
+                f"Resolve duplicate staging articles before migrating: {uuids}"
+            )
+
+        # The unique constraint's index replaces the plain one
+        await RawTable.raw("DROP INDEX IF EXISTS staging.staging_article_workflow_uuid")
+        await RawTable.raw(
+            """
+            ALTER TABLE staging.staging_article
+            ADD CONSTRAINT staging_article_workflow_uuid_key UNIQUE (workflow_uuid)
+            """
+        )
+
+    async def run_backwards():
+        await RawTable.raw(
+            """
+            ALTER TABLE staging.staging_article
+            DROP CONSTRAINT IF EXISTS staging_article_workflow_uuid_key
+            """
+        )
+        await RawTable.raw(
+            """
+            CREATE INDEX IF NOT EXISTS staging_article_workflow_uuid
+            ON staging.staging_article (workflow_uuid)
+            """
+        )
+
+    manager.add_raw(run)
+    manager.add_raw_backwards(run_backwards)
+
+    return manager
@@ -0,0 +1,125 @@
+"""
+Add an indexed product fingerprint to staging_product.
+ID: 2026-10-16T11:00:00:000000
+"""
+
+import hashlib
+import json
+import re
+
+from piccolo.apps.migrations.auto.migration_manager import MigrationManager
+from piccolo.table import Table
+
+
+ID = "2026-10-16T11:00:00:000000"
+VERSION = "1.30.0"
+DESCRIPTION = "Product fingerprint on staging_product"
+
+# Rows fingerprinted per UPDATE while backfilling
+BACKFILL_BATCH_SIZE = 1000
+
+# The fingerprint as defined when this migration was written (a copy of
+# backend.services.products, frozen so later changes there do not change
+# what this migration computes)
+ASIN_PATTERN = re.compile(r"/(?:dp|gp/product)/([A-Z0-9]{10})(?:[/?#]|$)")
+
+
+def find_asin(affiliate_links):
+    if isinstance(affiliate_links, str):
+        try:
+            affiliate_links = json.loads(affiliate_links)
+        except ValueError:
+            return None
+    if not isinstance(affiliate_links, dict):
+        return None
+
+    asin = affiliate_links.get("asin")
+    if isinstance(asin, str) and asin.strip():
+        return asin.strip().upper()
+
+    for url in affiliate_links.values():
+        if isinstance(url, str):
+            match = ASIN_PATTERN.search(url)
+            if match:
+                return match.group(1)
+    return None
+
+
+def normalize_name(value):
+    words = re.sub(r"[^\w]+", " ", (value or "").casefold()).split()
+    return " ".join(words)
+
+
+def product_fingerprint(product):
+    asin = find_asin(product.get("affiliate_links"))
+    if asin:
+        key = f"asin:{asin}"
+    else:
+        brand = normalize_name(product.get("brand"))
+        key = f"name:{brand}|{normalize_name(product.get('name'))}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class RawTable(Table):
+    pass
+
+
+async def forwards():
+    manager = MigrationManager(
+        migration_id=ID, app_name="backend", description=DESCRIPTION
+    )
+
+    async def run():
+        await RawTable.raw(
+            """
+            ALTER TABLE staging.staging_product
+            ADD COLUMN IF NOT EXISTS fingerprint VARCHAR(64)
+            """
+        )
+
+        # Existing products get the same fingerprint ingest would give them
+        last_id = 0
+        while True:
+            rows = await RawTable.raw(
+                """
+                SELECT staging_product_id, name, brand, affiliate_links
+                FROM staging.staging_product
+                WHERE staging_product_id > {} AND fingerprint IS NULL
+                ORDER BY staging_product_id
+                LIMIT {}
+                """,
+                last_id,
+                BACKFILL_BATCH_SIZE,
+            )
+            if not rows:
+                break
+
+            await RawTable.raw(
+                """
+                UPDATE staging.staging_product AS p
+                SET fingerprint = f.fingerprint
+                FROM unnest({}::int[], {}::varchar[]) AS f(id, fingerprint)
+                WHERE p.staging_product_id = f.id
+                """,
+                [row["staging_product_id"] for row in rows],
+                [product_fingerprint(row) for row in rows],
+            )
+            last_id = rows[-1]["staging_product_id"]
+
+        await RawTable.raw(
+            """
+            CREATE INDEX IF NOT EXISTS staging_product_fingerprint
+            ON staging.staging_product (fingerprint)
+            """
+        )
+
+    async def run_backwards():
+        await RawTable.raw("DROP INDEX IF EXISTS staging.staging_product_fingerprint")
+        await RawTable.raw(
+            "ALTER TABLE staging.staging_product DROP COLUMN IF EXISTS fingerprint"
+        )
+
+    manager.add_raw(run)
+    manager.add_raw_backwards(run_backwards)
+
+    return manager
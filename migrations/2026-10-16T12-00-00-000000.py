@@ -0,0 +1,45 @@
+"""
+Add lease columns to rejection_queue for claiming by pipeline workers.
+ID: 2026-10-16T12:00:00:000000
+"""
+
+from piccolo.apps.migrations.auto.migration_manager import MigrationManager
+from piccolo.table import Table
+
+
+ID = "2026-10-16T12:00:00:000000"
+VERSION = "1.30.0"
+DESCRIPTION = "Rejection queue leases"
+
+
+class RawTable(Table):
+    pass
+
+
+async def forwards():
+    manager = MigrationManager(
+        migration_id=ID, app_name="backend", description=DESCRIPTION
+    )
+
+    async def run():
+        await RawTable.raw(
+            """
+            ALTER TABLE staging.rejection_queue
+            ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(100),
+            ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP
+            """
+        )
+
+    async def run_backwards():
+        await RawTable.raw(
+            """
+            ALTER TABLE staging.rejection_queue
+            DROP COLUMN IF EXISTS lease_owner,
+            DROP COLUMN IF EXISTS lease_expires_at
+            """
+        )
+
+    manager.add_raw(run)
+    manager.add_raw_backwards(run_backwards)
+
+    return manager
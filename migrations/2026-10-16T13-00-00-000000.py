@@ -0,0 +1,81 @@
+"""
+Indexes for the hot queue predicates and child-table lookups.
+ID: 2026-10-16T13:00:00:000000
+"""
+
+from piccolo.apps.migrations.auto.migration_manager import MigrationManager
+from piccolo.table import Table
+
+
+ID = "2026-10-16T13:00:00:000000"
+VERSION = "1.30.0"
+DESCRIPTION = "Partial, composite and child-table indexes"
+
+# name -> definition; scripts/check_query_plans.py checks the queries using them
+INDEXES = {
+    # get_pending_rejections / claim_rejections
+    "rejection_queue_pending": """
+        ON staging.rejection_queue (rejected_at)
+        WHERE processed_by_pipeline = FALSE
+    """,
+    # list_pending_articles and /health
+    "staging_article_pending": """
+        ON staging.staging_article (submitted_at DESC)
+        WHERE status = 'pending'
+    """,
+    # Listings filtered by any other status
+    "staging_article_status_submitted": """
+        ON staging.staging_article (status, submitted_at)
+    """,
+    # fetch_full_staging_article and delete_staging_data
+    "staging_product_article": """
+        ON staging.staging_product (staging_article_id)
+    """,
+    "staging_article_image_article": """
+        ON staging.staging_article_image (staging_article_id, sequence_order)
+    """,
+    "staging_article_text_article": """
+        ON staging.staging_article_text (staging_article_id, sequence_order)
+    """,
+    "staging_product_image_product": """
+        ON staging.staging_product_image (staging_product_id, sequence_order)
+    """,
+    "staging_product_text_product": """
+        ON staging.staging_product_text (staging_product_id, sequence_order)
+    """,
+}
+
+# Single-column indexes from create_staging_tables.sql covered by the above
+REPLACED_INDEXES = {
+    "idx_staging_article_status": "ON staging.staging_article (status)",
+    "idx_rejection_queue_processed": (
+        "ON staging.rejection_queue (processed_by_pipeline)"
+    ),
+}
+
+
+class RawTable(Table):
+    pass
+
+
+async def forwards():
+    manager = MigrationManager(
+        migration_id=ID, app_name="backend", description=DESCRIPTION
+    )
+
+    async def run():
+        for name, definition in INDEXES.items():
+            await RawTable.raw(f"CREATE INDEX IF NOT EXISTS {name} {definition}")
+        for name in REPLACED_INDEXES:
+            await RawTable.raw(f"DROP INDEX IF EXISTS staging.{name}")
+
+    async def run_backwards():
+        for name, definition in REPLACED_INDEXES.items():
+            await RawTable.raw(f"CREATE INDEX IF NOT EXISTS {name} {definition}")
+        for name in INDEXES:
+            await RawTable.raw(f"DROP INDEX IF EXISTS staging.{name}")
+
+    manager.add_raw(run)
+    manager.add_raw_backwards(run_backwards)
+
+    return manager
@@ -0,0 +1,52 @@
+"""
+Record the workflow UUID of archived articles.
+ID: 2026-10-16T14:00:00:000000
+"""
+
+from piccolo.apps.migrations.auto.migration_manager import MigrationManager
+from piccolo.table import Table
+
+ID = "2026-10-16T14:00:00:000000"
+VERSION = "1.30.0"
+DESCRIPTION = "Workflow UUID column on the archive"
+
+
+class RawTable(Table):
+    pass
+
+
+async def forwards():
+    manager = MigrationManager(
+        migration_id=ID, app_name="backend", description=DESCRIPTION
+    )
+
+    async def run():
+        await RawTable.raw(
+            "ALTER TABLE staging.archive "
+            "ADD COLUMN IF NOT EXISTS workflow_uuid VARCHAR(36)"
+        )
+        # Backfill from the archived snapshots
+        await RawTable.raw("""
+            UPDATE staging.archive
+            SET workflow_uuid = article_data->'article'->>'workflow_uuid'
+            WHERE workflow_uuid IS NULL
+            """)
+        # find_existing_articles
+        await RawTable.raw("""
+            CREATE INDEX IF NOT EXISTS archive_approved_workflow_uuid
+            ON staging.archive (workflow_uuid)
+            WHERE action = 'approved'
+            """)
+
+    async def run_backwards():
+        await RawTable.raw(
+            "DROP INDEX IF EXISTS staging.archive_approved_workflow_uuid"
+        )
+        await RawTable.raw(
+            "ALTER TABLE staging.archive DROP COLUMN IF EXISTS workflow_uuid"
+        )
+
+    manager.add_raw(run)
+    manager.add_raw_backwards(run_backwards)
+
+    return manager
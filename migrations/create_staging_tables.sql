@@ -12,6 +12,7 @@ CREATE TABLE IF NOT EXISTS staging.staging_product (
     image_url TEXT NOT NULL,
     specs JSONB DEFAULT '{}',
     affiliate_links JSONB DEFAULT '{}',
+    fingerprint VARCHAR(64),
     staging_article_id INTEGER,
     created_at TIMESTAMP NOT NULL DEFAULT NOW()
 );
@@ -83,7 +84,9 @@ CREATE TABLE IF NOT EXISTS staging.rejection_queue (
     reviewer_comments TEXT NOT NULL,
     rejected_at TIMESTAMP NOT NULL DEFAULT NOW(),
     processed_by_pipeline BOOLEAN DEFAULT FALSE,
-    processed_at TIMESTAMP
+    processed_at TIMESTAMP,
+    lease_owner VARCHAR(100),
+    lease_expires_at TIMESTAMP
 );
 
 -- 8. Archive Table
@@ -91,6 +94,7 @@ CREATE TABLE IF NOT EXISTS staging.archive (
     archive_id SERIAL PRIMARY KEY,
     staging_article_id INTEGER NOT NULL,
     action VARCHAR(20) NOT NULL,
+    workflow_uuid VARCHAR(36),
     article_data JSONB NOT NULL,
     reviewer_comments TEXT,
     archived_at TIMESTAMP NOT NULL DEFAULT NOW(),
@@ -98,10 +102,18 @@ CREATE TABLE IF NOT EXISTS staging.archive (
 );
 
 -- Create indices for better performance
-CREATE INDEX IF NOT EXISTS idx_staging_article_status ON staging.staging_article(status);
 CREATE INDEX IF NOT EXISTS idx_staging_article_submitted ON staging.staging_article(submitted_at);
-CREATE INDEX IF NOT EXISTS idx_rejection_queue_processed ON staging.rejection_queue(processed_by_pipeline);
+CREATE INDEX IF NOT EXISTS staging_article_pending ON staging.staging_article(submitted_at DESC) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS staging_article_status_submitted ON staging.staging_article(status, submitted_at);
+CREATE INDEX IF NOT EXISTS rejection_queue_pending ON staging.rejection_queue(rejected_at) WHERE processed_by_pipeline = FALSE;
+CREATE INDEX IF NOT EXISTS staging_product_article ON staging.staging_product(staging_article_id);
+CREATE INDEX IF NOT EXISTS staging_article_image_article ON staging.staging_article_image(staging_article_id, sequence_order);
+CREATE INDEX IF NOT EXISTS staging_article_text_article ON staging.staging_article_text(staging_article_id, sequence_order);
+CREATE INDEX IF NOT EXISTS staging_product_image_product ON staging.staging_product_image(staging_product_id, sequence_order);
+CREATE INDEX IF NOT EXISTS staging_product_text_product ON staging.staging_product_text(staging_product_id, sequence_order);
 CREATE INDEX IF NOT EXISTS idx_archive_retention ON staging.archive(retention_until);
+CREATE INDEX IF NOT EXISTS archive_approved_workflow_uuid ON staging.archive(workflow_uuid) WHERE action = 'approved';
+CREATE INDEX IF NOT EXISTS staging_product_fingerprint ON staging.staging_product(fingerprint);
 
 -- Success message
 SELECT 'Staging tables created successfully!' AS status;
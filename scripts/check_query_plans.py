@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Check that the hot staging queries are planned as index scans.
+
+Usage:
+    python scripts/check_query_plans.py
+
+Each query below has the same shape as the one the application runs. It is
+EXPLAINed with sequential scans disabled (so the result does not depend on
+how many rows a development database happens to have) and must use the
+expected index from migrations/2026-10-16T13-00-00-000000.py. Exits with
+status 1 if any query would not use its index.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.db.connection import DB
+
+# (description, query, parameters, expected index)
+CHECKS = [
+    (
+        "get_pending_rejections",
+        """
+        SELECT rejection_id, workflow_uuid, reviewer_comments, rejected_at
+        FROM staging.rejection_queue
+        WHERE processed_by_pipeline = FALSE
+        ORDER BY rejected_at
+        """,
+        [],
+        "rejection_queue_pending",
+    ),
+    (
+        "claim_rejections",
+        """
+        SELECT rejection_id
+        FROM staging.rejection_queue
+        WHERE processed_by_pipeline = FALSE
+          AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+        ORDER BY rejected_at
+        LIMIT 10
+        FOR UPDATE SKIP LOCKED
+        """,
+        [],
+        "rejection_queue_pending",
+    ),
+    (
+        "list_pending_articles",
+        """
+        SELECT * FROM staging.staging_article
+        WHERE status = 'pending'
+        ORDER BY submitted_at DESC
+        """,
+        [],
+        "staging_article_pending",
+    ),
+    (
+        "/health pending count",
+        "SELECT COUNT(*) FROM staging.staging_article WHERE status = 'pending'",
+        [],
+        "staging_article_pending",
+    ),
+    (
+        "articles by status",
+        """
+        SELECT * FROM staging.staging_article
+        WHERE status = $1
+        ORDER BY submitted_at
+        """,
+        ["approved"],
+        "staging_article_status_submitted",
+    ),
+    (
+        "article products",
+        "SELECT * FROM staging.staging_product WHERE staging_article_id = $1",
+        [1],
+        "staging_product_article",
+    ),
+    (
+        "article images",
+        """
+        SELECT * FROM staging.staging_article_image
+        WHERE staging_article_id = $1
+        ORDER BY sequence_order
+        """,
+        [1],
+        "staging_article_image_article",
+    ),
+    (
+        "article texts",
+        """
+        SELECT * FROM staging.staging_article_text
+        WHERE staging_article_id = $1
+        ORDER BY sequence_order
+        """,
+        [1],
+        "staging_article_text_article",
+    ),
+    (
+        "product images",
+        """
+        SELECT * FROM staging.staging_product_image
+        WHERE staging_product_id = $1
+        ORDER BY sequence_order
+        """,
+        [1],
+        "staging_product_image_product",
+    ),
+    (
+        "product texts",
+        """
+        SELECT * FROM staging.staging_product_text
+        WHERE staging_product_id = $1
+        ORDER BY sequence_order
+        """,
+        [1],
+        "staging_product_text_product",
+    ),
+    (
+        "product usages",
+        "SELECT * FROM staging.staging_product WHERE fingerprint = $1",
+        ["0" * 64],
+        "staging_product_fingerprint",
+    ),
+]
+
+
+def plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """A plan node and all of its children"""
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def indexes_used(plan: Dict[str, Any]) -> List[str]:
+    """Names of the indexes a plan scans"""
+    return [node["Index Name"] for node in plan_nodes(plan) if "Index Name" in node]
+
+
+async def check_query_plans() -> bool:
+    """EXPLAIN every check; returns True if all use their index"""
+    connection = await DB.get_new_connection()
+    ok = True
+
+    try:
+        for description, query, params, expected in CHECKS:
+            async with connection.transaction():
+                # Only used to make the planner show which index it would pick
+                await connection.execute("SET LOCAL enable_seqscan = off")
+                explained = await connection.fetchval(
+                    f"EXPLAIN (FORMAT JSON) {query}", *params
+                )
+
+            plan = json.loads(explained)[0]["Plan"]
+            used = indexes_used(plan)
+            if expected in used:
+                print(f"OK    {description}: {expected}")
+            else:
+                ok = False
+                got = ", ".join(used) or plan["Node Type"]
+                print(f"FAIL  {description}: expected {expected}, got {got}")
+    finally:
+        await connection.close()
+
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(check_query_plans()) else 1)
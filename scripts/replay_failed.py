@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Inspect and replay the failed submit queue.
+
+Usage:
+    python scripts/replay_failed.py inspect [--limit 20]
+    python scripts/replay_failed.py replay [--rate 5] [--limit 100]
+
+Replayed messages are moved back onto the submit queue (or stream, with
+QUEUE_BACKEND=stream) at a throttled rate with their attempt count reset,
+so a large replay does not swamp the database.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.queue_backends import (
+    QUEUE_BACKEND,
+    STREAM_FIELD,
+    SUBMIT_QUEUE,
+    submit_stream_key,
+)
+from backend.services.queue_consumer import get_redis_client
+from backend.services.retry import ATTEMPT_FIELD, reset_attempts, retry_key
+
+FAILED_QUEUE = f"{SUBMIT_QUEUE}:failed"
+REPLAYING_QUEUE = f"{FAILED_QUEUE}:replaying"
+
+
+def describe(payload: str) -> str:
+    """One-line summary of a queued message"""
+    try:
+        data = json.loads(payload)
+    except json.JSONDecodeError:
+        return f"<invalid JSON, {len(payload)} bytes>"
+
+    if not isinstance(data, dict):
+        return f"<not an object, {len(payload)} bytes>"
+
+    return (
+        f"action={data.get('action')} uuid={data.get('article_uuid')} "
+        f"attempts={data.get(ATTEMPT_FIELD, 0)} size={len(payload)}"
+    )
+
+
+def inspect(client, limit: int):
+    """Print queue sizes and the first `limit` failed messages"""
+    print(f"Failed:    {client.llen(FAILED_QUEUE)}  ({FAILED_QUEUE})")
+    print(f"Retrying:  {client.zcard(retry_key(SUBMIT_QUEUE))}")
+    print(f"Replaying: {client.llen(REPLAYING_QUEUE)}  (interrupted replays)")
+    print()
+
+    for i, payload in enumerate(client.lrange(FAILED_QUEUE, 0, limit - 1)):
+        print(f"  [{i}] {describe(payload)}")
+
+
+def replay(client, rate: float, limit: int):
+    """Move up to `limit` failed messages back to the submit queue"""
+    if QUEUE_BACKEND == "stream":
+        target = submit_stream_key(SUBMIT_QUEUE)
+    else:
+        target = SUBMIT_QUEUE
+
+    # Finish replays interrupted by a previous run first
+    while client.lmove(REPLAYING_QUEUE, FAILED_QUEUE, "RIGHT", "LEFT"):
+        pass
+
+    replayed = 0
+    interval = 1.0 / rate if rate > 0 else 0
+    while replayed < limit:
+        # Claim one message, then hand it over atomically
+        payload = client.lmove(FAILED_QUEUE, REPLAYING_QUEUE, "LEFT", "RIGHT")
+        if payload is None:
+            break
+
+        pipe = client.pipeline(transaction=True)
+        if QUEUE_BACKEND == "stream":
+            pipe.xadd(target, {STREAM_FIELD: reset_attempts(payload)})
+        else:
+            pipe.rpush(target, reset_attempts(payload))
+        pipe.lrem(REPLAYING_QUEUE, 1, payload)
+        pipe.execute()
+
+        replayed += 1
+        if replayed % 100 == 0:
+            print(f"Replayed {replayed} message(s)...")
+        time.sleep(interval)
+
+    print(f"Replayed {replayed} message(s) to {target}")
+    print(f"Remaining in failed queue: {client.llen(FAILED_QUEUE)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and replay failed submissions")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    inspect_parser = subparsers.add_parser("inspect", help="Show failed messages")
+    inspect_parser.add_argument("--limit", type=int, default=20)
+
+    replay_parser = subparsers.add_parser("replay", help="Re-queue failed messages")
+    replay_parser.add_argument(
+        "--rate", type=float, default=5, help="Messages per second (0 = unthrottled)"
+    )
+    replay_parser.add_argument("--limit", type=int, default=100)
+
+    args = parser.parse_args()
+    client = get_redis_client()
+
+    try:
+        if args.command == "inspect":
+            inspect(client, args.limit)
+        else:
+            replay(client, args.rate, args.limit)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
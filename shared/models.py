@@ -4,8 +4,8 @@ These models are used for data validation and transfer between components.
 """
 
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import List, Literal, Optional, Dict, Any, Union
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 # ===== Base Models =====
@@ -123,6 +123,12 @@ class RejectionRequest(BaseModel):
     comments: str
 
 
+class RejectionAckRequest(BaseModel):
+    """Rejections processed by the AI pipeline"""
+
+    rejection_ids: List[int] = Field(min_length=1, max_length=10000)
+
+
 class ArchiveItem(BaseModel):
     """Archived article record"""
 
@@ -147,6 +153,149 @@ class RejectionQueueItem(BaseModel):
     processed_at: Optional[datetime]
 
 
+# ===== Ingest Models =====
+# Payloads accepted from the AI pipeline (/api/pipeline/submit*) and the
+# workflow submit queue. Field limits match the staging table columns, so a
+# payload that validates can be written without column errors.
+class SubmitImage(BaseModel):
+    url: str
+    alt_text: Optional[str] = Field(None, max_length=255)
+    sequence: int = 0
+
+
+class SubmitArticleImage(SubmitImage):
+    type: str = Field(max_length=50)  # 'hook', 'mindmap', 'general'
+
+
+class SubmitArticleText(BaseModel):
+    content: str
+    type: str = Field(max_length=50)  # section type
+    sequence: int = 0
+
+
+class SubmitProductText(BaseModel):
+    content: str
+    heading: Optional[str] = Field(None, max_length=255)
+    sequence: int = 0
+
+
+class SubmitProduct(BaseModel):
+    name: str = Field(max_length=255)
+    brand: str = Field(max_length=100)
+    category: str = Field(max_length=100)
+    price: float
+    description: str
+    image_url: str
+    specs: Dict[str, Any] = {}
+    affiliate_links: Dict[str, Any] = {}
+
+
+class SubmitArticle(BaseModel):
+    workflow_uuid: Optional[str] = Field(None, max_length=36)
+    title: str = Field(max_length=255)
+    category: str = Field(max_length=100)
+    author_name: Optional[str] = Field(None, max_length=100)
+    top_pick_index: int
+    runner_up_index: Optional[int] = None
+    budget_pick_index: Optional[int] = None
+
+
+class ArticleSubmission(BaseModel):
+    """Article submitted through the pipeline API"""
+
+    article: SubmitArticle
+    products: List[SubmitProduct] = []
+    article_images: List[SubmitArticleImage] = []
+    article_texts: List[SubmitArticleText] = []
+    # Keyed by product index
+    product_images: Dict[int, List[SubmitImage]] = {}
+    product_texts: Dict[int, List[SubmitProductText]] = {}
+
+    @model_validator(mode="after")
+    def check_product_indexes(self):
+        count = len(self.products)
+        picks = {
+            "top_pick_index": self.article.top_pick_index,
+            "runner_up_index": self.article.runner_up_index,
+            "budget_pick_index": self.article.budget_pick_index,
+        }
+        for name, index in picks.items():
+            if index is not None and not 0 <= index < count:
+                raise ValueError(f"article.{name} {index} is not a product index")
+        for name in ("product_images", "product_texts"):
+            for index in getattr(self, name):
+                if not 0 <= index < count:
+                    raise ValueError(f"{name} key {index} is not a product index")
+        return self
+
+
+class SubmitJobMessage(BaseModel):
+    """Queued asynchronous submit job"""
+
+    action: Literal["submit"] = "submit"
+    job_id: str
+    submission: ArticleSubmission
+
+
+class WorkflowProduct(BaseModel):
+    name: str = Field("Unknown Product", max_length=255)
+    brand: Optional[str] = Field(None, max_length=100)
+    price_inr: Optional[float] = None
+    image_urls: Optional[List[str]] = None
+    specs: Any = None  # Only kept if it is an object
+    affiliate_links: Optional[Dict[str, Any]] = {}
+    pick_type: Optional[str] = ""  # 'top_pick', 'value_pick', 'budget_pick'
+    pick_label: Optional[str] = ""
+    target_persona: Optional[str] = ""
+    best_for: Optional[str] = ""
+
+    @field_validator("name", "affiliate_links", mode="before")
+    @classmethod
+    def null_as_default(cls, value, info):
+        # The workflow sends missing values as null; use the field default
+        if value is None:
+            return cls.model_fields[info.field_name].get_default(
+                call_default_factory=True
+            )
+        return value
+
+
+class WorkflowContent(BaseModel):
+    full_article_html: Optional[str] = ""
+    # Optional sections may be sent as null and are then skipped
+    bullet_points: Optional[List[Any]] = None
+    mindmap_mermaid: Optional[str] = None
+    introduction: Optional[str] = None
+    mindmap_image: Optional[str] = None  # Base64 PNG
+
+    @field_validator("full_article_html", mode="before")
+    @classmethod
+    def null_html(cls, value):
+        return "" if value is None else value
+
+
+class WorkflowSubmitMessage(BaseModel):
+    """Article submitted by the workflow through the Redis submit queue"""
+
+    action: Literal["submit"]
+    article_uuid: Optional[str] = Field(None, max_length=36)
+    l3_category_id: Optional[Union[int, str]] = None
+    title: Optional[str] = Field(None, max_length=255)
+    content: Optional[WorkflowContent] = None
+    products: Optional[List[WorkflowProduct]] = []
+
+    @field_validator("content", mode="before")
+    @classmethod
+    def empty_content(cls, value):
+        # An empty content object means no content, not empty sections
+        return value or None
+
+    @field_validator("products", mode="before")
+    @classmethod
+    def null_products(cls, value):
+        return [] if value is None else value
+
+
 # ===== Stats Models =====
 class SystemStats(BaseModel):
     """System statistics for monitoring"""